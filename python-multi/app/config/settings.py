@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 
 
 @dataclass
@@ -18,7 +18,13 @@ class AppConfig:
     allowed_extensions_csv: str = ".dcm"
     restrict_extensions: bool = True
     include_no_extension: bool = True
+    # OFF skips stat() per file during analysis; size columns and totals are reported as 0.
+    # ON costs one lstat syscall per file on POSIX/network shares (Windows scandir already
+    # carries the size), in exchange for size totals in manifests and summary.
     collect_size_bytes: bool = False
+    # Concurrent directory listings during analysis. 1 = sequential walk (fastest on local disks);
+    # raise only for network shares where each listing waits on the server.
+    scan_workers: int = 1
     ts_mode: str = "AUTO"
     dcm4che_send_mode: str = "MANIFEST_FILES"
     dcm4che_iuid_update_mode: str = "REALTIME"
@@ -26,9 +32,15 @@ class AppConfig:
     internal_text_rotate_max_mb: int = 250
     # Parallel REST requests for validation/report queries (bounded for operational safety).
     validation_parallel_requests: int = 2
+    # Concurrent dcmdump processes when extracting IUID/TS metadata after each send chunk.
+    metadata_workers: int = 4
     # Optional safety check before sending each file with dcmtk (can be slow on large runs).
     send_precheck_before_send: bool = False
     # Prefer direct Java launcher with @argfile on Windows to avoid cmd line-length bottlenecks.
     dcm4che_prefer_java_direct: bool = True
     # Internal flag: keep Windows-stable wrapper for .bat execution by default.
     dcm4che_use_shell_wrapper: bool = True
+
+
+# Field names in declaration order (used to load/persist app_config.json without asdict()).
+APP_CONFIG_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(AppConfig))
@@ -5,6 +5,9 @@ import re
 CSV_SEP = ";"
 APP_DISPLAY_NAME = "DICOM Multi Toolkit"
 
+# send_status values counted as warnings (not failures) in send and validation summaries.
+SEND_WARNING_STATUSES = frozenset({"NON_DICOM", "UNSUPPORTED_DICOM_OBJECT", "SENT_UNKNOWN"})
+
 DCM4CHE_STORE_RQ_RE = re.compile(
     r"<<\s+\d+:C-STORE-RQ\[[\s\S]*?iuid=([0-9]+(?:\.[0-9]+)+)\s+-",
     re.IGNORECASE,
@@ -17,19 +20,27 @@ DCM4CHE_STORE_RSP_ERR_RE = re.compile(
     r">>\s+\d+:C-STORE-RSP\[[\s\S]*?status=(?!0H)([A-F0-9]+H)[\s\S]*?iuid=([0-9]+(?:\.[0-9]+)+)\s+-",
     re.IGNORECASE,
 )
+# Message header used by the single-pass dcm4che store log parser.
+DCM4CHE_STORE_HEADER_RE = re.compile(r"(<<|>>)\s+\d+:C-STORE-(RQ|RSP)\[", re.IGNORECASE)
+# storescu scan failures and the Java parse exceptions that follow them.
+DCM4CHE_FAILED_SCAN_RE = re.compile(r"Failed to scan file (.+?):\s*(.+)$")
+DCM4CHE_PARSE_EXCEPTION_RE = re.compile(
+    r"DicomStreamException|IllegalArgumentException|EOFException|Unrecognized VR code"
+)
 
-DCMTK_SENDING_FILE_RE = re.compile(r"I:\s+Sending file:\s+(.+)$")
-DCMTK_BAD_FILE_RE = re.compile(r"E:\s+Bad DICOM file:\s+(.+?):\s*(.+)$")
-DCMTK_STORE_RSP_RE = re.compile(r"I:\s+Received Store Response\s+\((.+)\)$")
-DCMTK_NO_SOP_UID_RE = re.compile(r"E:\s+No SOP Class or Instance UID in file:\s+(.+)$")
-DCMTK_STORE_FAILED_FILE_RE = re.compile(r"E:\s+Store Failed,\s*file:\s+(.+?):\s*$")
-DCMTK_STORE_FAILED_REASON_RE = re.compile(r"E:\s+([0-9A-F]{4}:[0-9A-F]{4}\s+.+)$", re.IGNORECASE)
+DCMTK_SENDING_FILE_RE = re.compile(r"^I:\s+Sending file:\s+(.+)$")
+DCMTK_BAD_FILE_RE = re.compile(r"^E:\s+Bad DICOM file:\s+(.+?):\s*(.+)$")
+DCMTK_STORE_RSP_RE = re.compile(r"^I:\s+Received Store Response\s+\((.+)\)$")
+DCMTK_NO_SOP_UID_RE = re.compile(r"^E:\s+No SOP Class or Instance UID in file:\s+(.+)$")
+DCMTK_STORE_FAILED_FILE_RE = re.compile(r"^E:\s+Store Failed,\s*file:\s+(.+?):\s*$")
+DCMTK_STORE_FAILED_REASON_RE = re.compile(r"^E:\s+([0-9A-F]{4}:[0-9A-F]{4}\s+.+)$", re.IGNORECASE)
+DCMTK_DUMP_FILE_HEADER_RE = re.compile(r"^# dcmdump \((\d+)/(\d+)\):\s+(.+)$", re.MULTILINE)
 UID_TAG_0008_0018 = re.compile(r"\(0008,0018\)[^\[]*\[([^\]]*)\]", re.IGNORECASE)
 UID_TAG_0002_0010 = re.compile(r"\(0002,0010\)[^\[]*\[([^\]]*)\]", re.IGNORECASE)
 UID_TAG_0002_0002 = re.compile(r"\(0002,0002\)[^\[]*\[([^\]]*)\]", re.IGNORECASE)
 UID_TAG_0008_0016 = re.compile(r"\(0008,0016\)[^\[]*\[([^\]]*)\]", re.IGNORECASE)
 TAG_0004_1220_RE = re.compile(r"\(0004,1220\)", re.IGNORECASE)
-UID_VALUE_RE = re.compile(r"[0-9]+(?:\.[0-9]+)+")
+UID_VALUE_RE = re.compile(r"[0-9]+(?:\.[0-9]+)+", re.ASCII)
 MEDIA_STORAGE_DIRECTORY_STORAGE_UID = "1.2.840.10008.1.3.10"
 IS_WINDOWS = os.name == "nt"
 WINDOWS_CMD_SAFE_MAX_CHARS = 7600
@@ -1,6 +1,12 @@
 import csv
+import json
+import os
+import queue
 import re
+import threading
+from functools import lru_cache
 from pathlib import Path
+from typing import Iterator, NamedTuple
 
 from app.domain.constants import CSV_SEP
 from app.shared.utils import now_dual_timestamp, now_iso
@@ -82,6 +88,15 @@ def rotate_text_artifact_if_needed(path: Path, max_bytes: int, logger=None) -> P
     return None
 
 
+# Header of CSV artifacts opened for append. Keyed by path plus mtime/size, so a rewritten or
+# replaced file is read again; bounded so long sessions do not keep every path ever opened.
+@lru_cache(maxsize=256)
+def _read_csv_header(path: str, mtime_ns: int, size: int) -> tuple[str, ...]:
+    with open(path, "r", newline="", encoding="utf-8", errors="replace") as f:
+        first = f.readline().strip()
+    return tuple(next(csv.reader([first], delimiter=CSV_SEP))) if first else ()
+
+
 def _artifact_exists_or_has_segments(path: Path) -> bool:
     return path.exists() or bool(list_incremental_rotated_paths(path))
 
@@ -90,67 +105,191 @@ def _maybe_rotate_internal_text(path: Path) -> None:
     rotate_text_artifact_if_needed(path, _INTERNAL_TEXT_ROTATE_MAX_BYTES)
 
 
+class CsvAppender:
+    """
+    Append-only CSV artifact kept open across writes.
+
+    Same schema rules as append_csv_rows (timestamp columns on new files, header of an existing
+    file wins), but mkdir/header/open happen once. Rotation is checked every
+    `rotate_check_rows` rows and on flush(), so call close() (or use as a context manager).
+    """
+
+    def __init__(self, path: Path, fieldnames: list[str], rotate_check_rows: int = 2000):
+        self.path = path
+        self.fieldnames = list(fieldnames)
+        self.rotate_check_rows = max(1, int(rotate_check_rows))
+        self.active_fields: list[str] = []
+        self._file = None
+        self._writer = None
+        self._rows_since_check = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _maybe_rotate_internal_text(path)
+        self._open()
+
+    def _open(self) -> None:
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            st = None
+        write_header = st is None
+        active_fields = list(self.fieldnames)
+        if write_header:
+            if "timestamp_br" not in active_fields:
+                active_fields.append("timestamp_br")
+            if "timestamp_iso" not in active_fields:
+                active_fields.append("timestamp_iso")
+        else:
+            # Keep compatibility when appending to older CSV schemas.
+            header = _read_csv_header(str(self.path), st.st_mtime_ns, st.st_size)
+            if header:
+                active_fields = list(header)
+        self.active_fields = active_fields
+        self._stamp_rows = "timestamp_br" in active_fields
+        self._file = self.path.open("a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file, delimiter=CSV_SEP)
+        if write_header:
+            self._writer.writerow(active_fields)
+
+    def writerow(self, row: dict) -> None:
+        self.writerows([row])
+
+    def writerows(self, rows: list[dict]) -> None:
+        if self._writer is None:
+            raise RuntimeError(f"CsvAppender fechado: {self.path}")
+        active_fields = self.active_fields
+        # One timestamp pair per batch (second precision, same as the formatted value).
+        stamp: dict[str, str] | None = None
+        for row in rows:
+            row_data = row
+            if self._stamp_rows and "timestamp_br" not in row_data:
+                if stamp is None:
+                    ts_br, ts_iso = now_dual_timestamp()
+                    stamp = {"timestamp_br": ts_br, "timestamp_iso": ts_iso}
+                row_data = {**row, **stamp}
+            self._writer.writerow([row_data.get(k, "") for k in active_fields])
+        self._rows_since_check += len(rows)
+        if self._rows_since_check >= self.rotate_check_rows:
+            self._check_rotation()
+
+    def _check_rotation(self) -> None:
+        self._rows_since_check = 0
+        self._file.flush()
+        try:
+            size = self.path.stat().st_size
+        except Exception:
+            return
+        if size < _INTERNAL_TEXT_ROTATE_MAX_BYTES:
+            return
+        self._file.close()
+        _maybe_rotate_internal_text(self.path)
+        self._open()
+
+    def flush(self) -> None:
+        if self._file is not None:
+            self._check_rotation()
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        finally:
+            self._file = None
+            self._writer = None
+
+    def __enter__(self) -> "CsvAppender":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
 def append_csv_rows(path: Path, rows: list[dict], fieldnames: list[str]) -> None:
     if not rows:
         return
-    path.parent.mkdir(parents=True, exist_ok=True)
-    _maybe_rotate_internal_text(path)
-    write_header = not path.exists()
-    active_fields = list(fieldnames)
-    if write_header:
-        if "timestamp_br" not in active_fields:
-            active_fields.append("timestamp_br")
-        if "timestamp_iso" not in active_fields:
-            active_fields.append("timestamp_iso")
-    else:
-        # Keep compatibility when appending to older CSV schemas.
-        with path.open("r", newline="", encoding="utf-8", errors="replace") as f:
-            first = f.readline().strip()
-        if first:
-            active_fields = next(csv.reader([first], delimiter=CSV_SEP))
-
-    with path.open("a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=active_fields, delimiter=CSV_SEP)
-        if write_header:
-            writer.writeheader()
-        for row in rows:
-            row_data = dict(row)
-            if "timestamp_br" in active_fields and "timestamp_br" not in row_data:
-                ts_br, ts_iso = now_dual_timestamp()
-                row_data["timestamp_br"] = ts_br
-                row_data["timestamp_iso"] = ts_iso
-            writer.writerow({k: row_data.get(k, "") for k in active_fields})
+    with CsvAppender(path, fieldnames) as writer:
+        writer.writerows(rows)
 
 
 def write_csv_row(path: Path, row: dict, fieldnames: list[str]) -> None:
     append_csv_rows(path, [row], fieldnames)
 
 
-def read_csv_rows(path: Path) -> list[dict]:
-    ordered_segments = list_incremental_rotated_paths(path)
-    ordered_files = [*ordered_segments]
+def iter_csv_rows(path: Path) -> Iterator[dict]:
+    """Yield rows from rotated segments (oldest first) and then the base file, one at a time."""
+    ordered_files = list_incremental_rotated_paths(path)
+    if path.exists():
+        ordered_files.append(path)
+    for fp in ordered_files:
+        try:
+            with fp.open("r", newline="", encoding="utf-8", errors="replace") as f:
+                yield from csv.DictReader(f, delimiter=CSV_SEP)
+        except Exception:
+            continue
+
+
+def iter_csv_columns(path: Path, columns: list[str]) -> Iterator[tuple[str, ...]]:
+    """Like iter_csv_rows, but yield only the requested columns as tuples (missing columns as "")."""
+    ordered_files = list_incremental_rotated_paths(path)
     if path.exists():
         ordered_files.append(path)
-    if not ordered_files:
-        return []
-    rows: list[dict] = []
     for fp in ordered_files:
         try:
             with fp.open("r", newline="", encoding="utf-8", errors="replace") as f:
-                rows.extend(list(csv.DictReader(f, delimiter=CSV_SEP)))
+                reader = csv.reader(f, delimiter=CSV_SEP)
+                header = next(reader, None)
+                if not header:
+                    continue
+                positions = [header.index(name) if name in header else -1 for name in columns]
+                for row in reader:
+                    if not row:
+                        continue
+                    width = len(row)
+                    yield tuple(row[i] if 0 <= i < width else "" for i in positions)
         except Exception:
             continue
-    return rows
+
+
+def read_csv_rows(path: Path) -> list[dict]:
+    return list(iter_csv_rows(path))
 
 
 def write_csv_table(path: Path, rows: list[dict], fieldnames: list[str]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     _maybe_rotate_internal_text(path)
     with path.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter=CSV_SEP)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow({k: row.get(k, "") for k in fieldnames})
+        writer = csv.writer(f, delimiter=CSV_SEP)
+        writer.writerow(fieldnames)
+        writer.writerows([row.get(k, "") for k in fieldnames] for row in rows)
+
+
+def read_json_artifact(path: Path):
+    # json.loads accepts UTF-8 bytes directly; skips the text-mode decode step.
+    return json.loads(path.read_bytes())
+
+
+def _discard_tmp(tmp_path: Path) -> None:
+    try:
+        tmp_path.unlink()
+    except OSError:
+        pass
+
+
+def write_json_artifact(path: Path, payload) -> None:
+    # Compact JSON swapped in atomically, so a concurrent reader never sees a half-written file.
+    data = json.dumps(payload, ensure_ascii=True, separators=(",", ":")).encode("ascii")
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        tmp_path.write_bytes(data)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:
+            # Windows refuses the swap while another handle has the target open; write in place instead.
+            path.write_bytes(data)
+            _discard_tmp(tmp_path)
+    except Exception:
+        _discard_tmp(tmp_path)
+        raise
 
 
 RUN_SUBDIR_CORE = "core"
@@ -186,11 +325,17 @@ RUN_ARTIFACT_SUBDIR: dict[str, str] = {
 }
 
 
+# Relative (categorized, legacy) paths per known artifact, composed once at import.
+RUN_ARTIFACT_REL: dict[str, tuple[Path, Path]] = {
+    name: (Path(subdir) / name, Path(name)) for name, subdir in RUN_ARTIFACT_SUBDIR.items()
+}
+
+
 def run_artifact_variants(run_dir: Path, filename: str) -> tuple[Path, Path]:
-    subdir = RUN_ARTIFACT_SUBDIR.get(filename, RUN_SUBDIR_CORE)
-    categorized_path = run_dir / subdir / filename
-    legacy_path = run_dir / filename
-    return categorized_path, legacy_path
+    rel = RUN_ARTIFACT_REL.get(filename)
+    if rel is None:
+        rel = (Path(RUN_SUBDIR_CORE) / filename, Path(filename))
+    return run_dir / rel[0], run_dir / rel[1]
 
 
 def resolve_run_artifact_path(
@@ -257,91 +402,259 @@ def resolve_run_batch_args_dir(run_dir: Path, *, for_write: bool, logger=None) -
     return chosen
 
 
+TELEMETRY_EVENT_FIELDS = ["run_id", "event_type", "timestamp_iso", "message", "ref"]
+
+
 def write_telemetry_event(path: Path, run_id: str, event_type: str, message: str, ref: str = "") -> None:
-    fields = ["run_id", "event_type", "timestamp_iso", "message", "ref"]
+    fields = TELEMETRY_EVENT_FIELDS
     path.parent.mkdir(parents=True, exist_ok=True)
     _maybe_rotate_internal_text(path)
     write_header = not path.exists()
     with path.open("a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fields, delimiter=CSV_SEP)
+        writer = csv.writer(f, delimiter=CSV_SEP)
         if write_header:
-            writer.writeheader()
-        writer.writerow(
-            {
-                "run_id": run_id,
-                "event_type": event_type,
-                "timestamp_iso": now_iso(),
-                "message": message,
-                "ref": ref,
-            }
-        )
+            writer.writerow(fields)
+        writer.writerow([run_id, event_type, now_iso(), message, ref])
+
+
+def write_telemetry_events(path: Path, rows: list[tuple]) -> None:
+    """Append pre-built (run_id, event_type, timestamp_iso, message, ref) rows in one open."""
+    if not rows:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _maybe_rotate_internal_text(path)
+    write_header = not path.exists()
+    with path.open("a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=CSV_SEP)
+        if write_header:
+            writer.writerow(TELEMETRY_EVENT_FIELDS)
+        writer.writerows(rows)
+
+
+class TelemetryEventEmitter:
+    """
+    Asynchronous writer for events.csv.
+
+    emit() only enqueues the row (timestamp taken at emit time); a daemon thread drains the
+    queue in batches of up to `batch_max` rows and appends each batch with a single open.
+    The queue is bounded, so a stalled disk back-pressures the producer instead of growing RAM.
+    A failed batch is retried once, then written row by row; rows that still fail are counted
+    in `dropped_events`. Call close() to drain and stop the worker: it returns the first write
+    error behind dropped rows (None if every row was written).
+    """
+
+    _STOP = object()
+
+    def __init__(self, path: Path, *, queue_max: int = 10000, batch_max: int = 512):
+        self.path = path
+        self.batch_max = max(1, int(batch_max))
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(queue_max)))
+        self._closed = False
+        self.dropped_events = 0
+        self.first_error: Exception | None = None
+        self._thread = threading.Thread(target=self._drain_loop, name="telemetry-events", daemon=True)
+        self._thread.start()
+
+    def emit(self, run_id: str, event_type: str, message: str, ref: str = "") -> None:
+        if self._closed:
+            write_telemetry_event(self.path, run_id, event_type, message, ref)
+            return
+        self._queue.put((run_id, event_type, now_iso(), message, ref))
+
+    def _drain_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            stop = item is self._STOP
+            batch = [] if stop else [item]
+            while not stop and len(batch) < self.batch_max:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            if batch:
+                self._write_batch_with_fallback(batch)
+            if stop:
+                return
+
+    def _write_batch(self, batch: list[tuple]) -> None:
+        write_telemetry_events(self.path, batch)
+
+    def _write_batch_with_fallback(self, batch: list[tuple]) -> None:
+        # Telemetry must never break the workflow, but lost rows are reported through close().
+        try:
+            self._write_batch(batch)
+            return
+        except Exception as ex:
+            error = ex
+        try:
+            # Transient failures (e.g. events.csv briefly locked on Windows) usually clear at once.
+            self._write_batch(batch)
+            return
+        except Exception:
+            pass
+        dropped = 0
+        for row in batch:
+            try:
+                # Single-row append keeps the timestamp taken at emit time.
+                self._write_batch([row])
+            except Exception:
+                dropped += 1
+        if dropped:
+            self.dropped_events += dropped
+            if self.first_error is None:
+                self.first_error = error
+
+    def close(self) -> Exception | None:
+        if not self._closed:
+            self._closed = True
+            self._queue.put(self._STOP)
+            self._thread.join()
+        return self.first_error
+
 
+class IuidMapEntry(NamedTuple):
+    """IUID/transfer syntax known for one file (one per file, so kept as a tuple, not a dict)."""
 
-def build_iuid_map_from_send_rows(send_rows: list[dict]) -> dict[str, dict]:
-    out: dict[str, dict] = {}
+    sop_instance_uid: str
+    source_ts_uid: str = ""
+    source_ts_name: str = ""
+    extract_status: str = ""
+
+
+EMPTY_IUID_MAP_ENTRY = IuidMapEntry("")
+
+
+def build_iuid_map_from_send_rows(send_rows: list[dict]) -> dict[str, IuidMapEntry]:
+    out: dict[str, IuidMapEntry] = {}
     for row in send_rows:
         fp = str(row.get("file_path", "")).strip()
         iuid = str(row.get("sop_instance_uid", "")).strip()
         if not fp or not iuid:
             continue
-        out[fp] = {
-            "sop_instance_uid": iuid,
-            "source_ts_uid": str(row.get("source_ts_uid", "")).strip(),
-            "source_ts_name": str(row.get("source_ts_name", "")).strip(),
-            "extract_status": str(row.get("extract_status", "")).strip(),
-        }
+        out[fp] = IuidMapEntry(
+            iuid,
+            str(row.get("source_ts_uid", "")).strip(),
+            str(row.get("source_ts_name", "")).strip(),
+            str(row.get("extract_status", "")).strip(),
+        )
     return out
 
 
-def merge_iuid_map_from_legacy_file(map_by_file: dict[str, dict], legacy_map_path: Path) -> None:
+def merge_iuid_map_from_legacy_file(map_by_file: dict[str, IuidMapEntry], legacy_map_path: Path) -> None:
     if not legacy_map_path.exists():
         return
-    for row in read_csv_rows(legacy_map_path):
+    for row in iter_csv_rows(legacy_map_path):
         fp = str(row.get("file_path", "")).strip()
         iuid = str(row.get("sop_instance_uid", "")).strip()
         if not fp or not iuid or fp in map_by_file:
             continue
-        map_by_file[fp] = {
-            "sop_instance_uid": iuid,
-            "source_ts_uid": str(row.get("source_ts_uid", "")).strip(),
-            "source_ts_name": str(row.get("source_ts_name", "")).strip(),
-            "extract_status": str(row.get("extract_status", "")).strip(),
-        }
+        map_by_file[fp] = IuidMapEntry(
+            iuid,
+            str(row.get("source_ts_uid", "")).strip(),
+            str(row.get("source_ts_name", "")).strip(),
+            str(row.get("extract_status", "")).strip(),
+        )
+
+
+_SEND_RESULT_UPDATE_KEYS = ["sop_instance_uid", "source_ts_uid", "source_ts_name", "extract_status"]
+
+
+def _send_results_segment_needs_update(segment: Path, run_id: str, updates_by_file: dict[str, dict]) -> bool:
+    # Read-only scan: stops at the first row an update would actually change.
+    with segment.open("r", newline="", encoding="utf-8", errors="replace") as src:
+        reader = csv.reader(src, delimiter=CSV_SEP)
+        header = next(reader, None)
+        if not header:
+            return False
+        idx = {name: pos for pos, name in enumerate(header)}
+        run_pos = idx.get("run_id")
+        file_pos = idx.get("file_path")
+        if run_pos is None or file_pos is None:
+            return False
+        key_pos = [(key, idx.get(key)) for key in _SEND_RESULT_UPDATE_KEYS]
+        for rec in reader:
+            if len(rec) <= max(run_pos, file_pos) or rec[run_pos].strip() != run_id:
+                continue
+            upd = updates_by_file.get(rec[file_pos].strip())
+            if not upd:
+                continue
+            for key, pos in key_pos:
+                new_val = str(upd.get(key, "")).strip()
+                if new_val and (pos is None or pos >= len(rec) or rec[pos].strip() != new_val):
+                    return True
+    return False
+
+
+def _rewrite_send_results_segment(segment: Path, run_id: str, updates_by_file: dict[str, dict]) -> int:
+    # Stream one CSV file into a sibling .tmp, patching matching rows, then swap it in atomically.
+    tmp_path = segment.with_name(segment.name + ".tmp")
+    changed_rows = 0
+    fieldnames: list[str] = []
+    replaced = False
+    try:
+        with segment.open("r", newline="", encoding="utf-8", errors="replace") as src, tmp_path.open(
+            "w", newline="", encoding="utf-8"
+        ) as dst:
+            reader = csv.reader(src, delimiter=CSV_SEP)
+            header = next(reader, None)
+            if not header:
+                return 0
+            fieldnames = list(header)
+            for key in _SEND_RESULT_UPDATE_KEYS:
+                if key not in fieldnames:
+                    fieldnames.append(key)
+            idx = {name: pos for pos, name in enumerate(fieldnames)}
+            run_pos = idx.get("run_id")
+            file_pos = idx.get("file_path")
+            header_len = len(header)
+            width = len(fieldnames)
+            writer = csv.writer(dst, delimiter=CSV_SEP)
+            writer.writerow(fieldnames)
+            for rec in reader:
+                if not rec:
+                    continue
+                rec = rec[:header_len]
+                if len(rec) < width:
+                    rec.extend([""] * (width - len(rec)))
+                upd = None
+                if run_pos is not None and file_pos is not None and rec[run_pos].strip() == run_id:
+                    fp = rec[file_pos].strip()
+                    upd = updates_by_file.get(fp) if fp else None
+                if upd:
+                    row_changed = False
+                    for key in _SEND_RESULT_UPDATE_KEYS:
+                        new_val = str(upd.get(key, "")).strip()
+                        if not new_val:
+                            continue
+                        pos = idx[key]
+                        if rec[pos].strip() != new_val:
+                            rec[pos] = new_val
+                            row_changed = True
+                    if row_changed:
+                        changed_rows += 1
+                writer.writerow(rec)
+        if changed_rows > 0:
+            os.replace(tmp_path, segment)
+            replaced = True
+    finally:
+        # Nothing to swap in, or the rewrite failed midway: never leave the .tmp behind.
+        if not replaced:
+            _discard_tmp(tmp_path)
+    return changed_rows
 
 
 def apply_send_result_updates(send_results_path: Path, run_id: str, updates_by_file: dict[str, dict]) -> int:
     if not updates_by_file or not send_results_path.exists():
         return 0
-    rows = read_csv_rows(send_results_path)
-    if not rows:
-        return 0
-
     changed_rows = 0
-    update_keys = ["sop_instance_uid", "source_ts_uid", "source_ts_name", "extract_status"]
-    for row in rows:
-        if str(row.get("run_id", "")).strip() != run_id:
-            continue
-        fp = str(row.get("file_path", "")).strip()
-        if not fp:
+    # Each rotated segment is patched in place so rows are never duplicated into the base file.
+    # Segments without any affected row are only read, never copied to a .tmp.
+    for segment in [*list_incremental_rotated_paths(send_results_path), send_results_path]:
+        if not _send_results_segment_needs_update(segment, run_id, updates_by_file):
             continue
-        upd = updates_by_file.get(fp)
-        if not upd:
-            continue
-        row_changed = False
-        for key in update_keys:
-            new_val = str(upd.get(key, "")).strip()
-            if not new_val:
-                continue
-            if str(row.get(key, "")).strip() != new_val:
-                row[key] = new_val
-                row_changed = True
-        if row_changed:
-            changed_rows += 1
-
-    if changed_rows > 0:
-        fieldnames = list(rows[0].keys())
-        for key in update_keys:
-            if key not in fieldnames:
-                fieldnames.append(key)
-        write_csv_table(send_results_path, rows, fieldnames)
+        changed_rows += _rewrite_send_results_segment(segment, run_id, updates_by_file)
     return changed_rows
@@ -1,11 +1,13 @@
+import locale
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 from app.config.settings import AppConfig
 from app.domain.constants import (
-    DCM4CHE_STORE_RQ_RE,
-    DCM4CHE_STORE_RSP_ERR_RE,
-    DCM4CHE_STORE_RSP_OK_RE,
+    DCM4CHE_STORE_HEADER_RE,
+    DCMTK_DUMP_FILE_HEADER_RE,
     DCMTK_NO_SOP_UID_RE,
     DCMTK_SENDING_FILE_RE,
     DCMTK_STORE_FAILED_FILE_RE,
@@ -20,17 +22,43 @@ from app.domain.constants import (
 )
 from app.shared.utils import hidden_process_kwargs, normalize_uid_candidate, parse_dcmtk_bad_dicom_line
 
+# Files per dcmdump invocation when extracting metadata in batch (keeps the command line well below
+# the Windows limit even with long paths).
+METADATA_BATCH_MAX_FILES = 64
+
+# Toolkit consoles write in the locale code page (e.g. cp1252 on Windows), as text=True assumed.
+_TOOLKIT_OUTPUT_ENCODING = locale.getpreferredencoding(False)
+
+
+def _decode_toolkit_output(raw: bytes | None) -> str:
+    """Decode captured toolkit stdout/stderr; undecodable bytes become U+FFFD instead of raising."""
+    return (raw or b"").decode(_TOOLKIT_OUTPUT_ENCODING, errors="replace")
+
+
+# (base_dir, prefix, filename) -> (toolkits dir mtime_ns, resolved bin dir). Misses are not cached:
+# a binary unpacked inside an existing toolkit folder does not change the toolkits mtime.
+_TOOLKIT_BIN_CACHE: dict[tuple[str, str, str], tuple[int, str]] = {}
+
 
 def find_toolkit_bin(base_dir: Path, toolkit_prefix: str, filename: str) -> str:
     toolkits_dir = base_dir / "toolkits"
-    if not toolkits_dir.exists():
+    try:
+        toolkits_mtime = toolkits_dir.stat().st_mtime_ns
+    except OSError:
         return ""
+    key = (str(base_dir), toolkit_prefix.lower(), filename)
+    cached = _TOOLKIT_BIN_CACHE.get(key)
+    # Reuse the previous scan while the toolkits folder is unchanged and the binary is still there.
+    if cached is not None and cached[0] == toolkits_mtime and (Path(cached[1]) / filename).exists():
+        return cached[1]
     candidates = [p for p in toolkits_dir.iterdir() if p.is_dir() and p.name.lower().startswith(toolkit_prefix.lower())]
     candidates.sort(reverse=True)
     for cand in candidates:
         bin_dir = cand / "bin"
         if (bin_dir / filename).exists():
+            _TOOLKIT_BIN_CACHE[key] = (toolkits_mtime, str(bin_dir))
             return str(bin_dir)
+    _TOOLKIT_BIN_CACHE.pop(key, None)
     return ""
 
 
@@ -51,6 +79,10 @@ def apply_internal_toolkit_paths(cfg: AppConfig, base_dir: Path, logger=None) ->
     return cfg
 
 
+# extract_metadata_batch: file path -> (iuid, ts_uid, ts_name, err), or the exception it raised.
+MetadataBatchResult = dict[str, tuple[str, str, str, str] | Exception]
+
+
 class ToolkitDriver:
     toolkit_name = "base"
 
@@ -63,12 +95,248 @@ class ToolkitDriver:
     def extract_metadata(self, cfg: AppConfig, file_path: Path) -> tuple[str, str, str, str]:
         raise NotImplementedError
 
-    def parse_send_output(self, lines: list[str], batch_files: list[Path]) -> dict[str, dict]:
+    def extract_metadata_batch(self, cfg: AppConfig, files: list[Path]) -> MetadataBatchResult:
+        return self._extract_metadata_per_file(cfg, files)
+
+    def _extract_metadata_per_file(self, cfg: AppConfig, files: list[Path]) -> MetadataBatchResult:
+        # One dcmdump per file, run on up to cfg.metadata_workers threads (each call is a child
+        # process, so threads overlap process startup and disk reads). Files that raise map to
+        # the exception, so callers apply their per-file handling without running dcmdump again.
+        out: MetadataBatchResult = {}
+        workers = min(_metadata_workers(cfg), len(files))
+        if workers <= 1:
+            for file_path in files:
+                try:
+                    out[str(file_path)] = self.extract_metadata(cfg, file_path)
+                except Exception as ex:
+                    out[str(file_path)] = ex
+            return out
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="metadata") as pool:
+            futures = [(file_path, pool.submit(self.extract_metadata, cfg, file_path)) for file_path in files]
+            for file_path, future in futures:
+                try:
+                    out[str(file_path)] = future.result()
+                except Exception as ex:
+                    out[str(file_path)] = ex
+        return out
+
+    def _extract_metadata_grouped(self, cfg: AppConfig, files: list[Path]) -> MetadataBatchResult:
+        # Bundled DCMTK dcmdump reads the two tags for up to METADATA_BATCH_MAX_FILES files per
+        # call; files it cannot parse (or every file, without that dcmdump) go through
+        # extract_metadata one by one.
+        dcmdump = _dcmtk_dcmdump_path(cfg)
+        if dcmdump is None:
+            return self._extract_metadata_per_file(cfg, files)
+        out, retry = _dcmtk_dump_metadata_groups(dcmdump, files, _metadata_workers(cfg))
+        if retry:
+            out.update(self._extract_metadata_per_file(cfg, retry))
+        return out
+
+    def send_output_parser(self, batch_files: list[Path]):
+        """Return a parser with feed(line) and result() for the storescu output of one chunk."""
         raise NotImplementedError
 
+    def parse_send_output(self, lines: list[str], batch_files: list[Path]) -> dict[str, dict]:
+        parser = self.send_output_parser(batch_files)
+        for line in lines:
+            parser.feed(line)
+        return parser.result()
+
     def dcmdump_text(self, cmd: list[str]) -> str:
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=30, check=False, **hidden_process_kwargs())
-        return ((proc.stdout or "") + "\n" + (proc.stderr or "")).strip()
+        # Capture raw bytes and decode once; avoids the text-mode codec wrapper on each pipe.
+        proc = subprocess.run(cmd, capture_output=True, timeout=30, check=False, **hidden_process_kwargs())
+        return (_decode_toolkit_output(proc.stdout) + "\n" + _decode_toolkit_output(proc.stderr)).strip()
+
+
+def _metadata_workers(cfg: AppConfig) -> int:
+    try:
+        return min(16, max(1, int(getattr(cfg, "metadata_workers", AppConfig.metadata_workers))))
+    except Exception:
+        return AppConfig.metadata_workers
+
+
+def _dcmtk_dcmdump_path(cfg: AppConfig) -> Path | None:
+    if not cfg.dcmtk_bin_path:
+        return None
+    dcmdump = Path(cfg.dcmtk_bin_path) / "dcmdump.exe"
+    return dcmdump if dcmdump.exists() else None
+
+
+def _dcmtk_dump_metadata_group(
+    dcmdump: Path, group: list[Path]
+) -> tuple[dict[str, tuple[str, str, str, str]], list[Path]]:
+    out: dict[str, tuple[str, str, str, str]] = {}
+    retry: list[Path] = []
+    cmd = [str(dcmdump), "+F", "+P", "0008,0018", "+P", "0002,0010", *[str(p) for p in group]]
+    try:
+        proc = subprocess.run(
+            cmd,
+            capture_output=True,
+            timeout=30 + len(group),
+            check=False,
+            **hidden_process_kwargs(),
+        )
+        stdout = _decode_toolkit_output(proc.stdout)
+    except Exception:
+        return out, list(group)
+    headers = list(DCMTK_DUMP_FILE_HEADER_RE.finditer(stdout))
+    sections: dict[int, str] = {}
+    for pos, m_head in enumerate(headers):
+        end = headers[pos + 1].start() if pos + 1 < len(headers) else len(stdout)
+        sections[int(m_head.group(1))] = stdout[m_head.end() : end]
+    for idx, file_path in enumerate(group, start=1):
+        section = sections.get(idx, "")
+        iuid_m = UID_TAG_0008_0018.search(section)
+        if not iuid_m:
+            retry.append(file_path)
+            continue
+        ts_m = UID_TAG_0002_0010.search(section)
+        iuid = normalize_uid_candidate(iuid_m.group(1))
+        ts_uid = normalize_uid_candidate(ts_m.group(1) if ts_m else "")
+        out[str(file_path)] = (iuid, ts_uid, ts_uid, "")
+    return out, retry
+
+
+def _dcmtk_dump_metadata_groups(
+    dcmdump: Path, files: list[Path], workers: int = 1
+) -> tuple[dict[str, tuple[str, str, str, str]], list[Path]]:
+    """
+    Extract (iuid, ts_uid, ts_name, err) for many files with one dcmdump.exe per group.
+
+    dcmdump +F prints a "# dcmdump (i/n): <file>" header before each dataset, so the
+    concatenated stdout is split on those headers. Files whose section yields no IUID
+    (unreadable, non-DICOM, unexpected output) are returned for a per-file retry.
+    Groups run on up to `workers` threads.
+    """
+    groups = [files[i : i + METADATA_BATCH_MAX_FILES] for i in range(0, len(files), METADATA_BATCH_MAX_FILES)]
+    out: dict[str, tuple[str, str, str, str]] = {}
+    retry: list[Path] = []
+    workers = min(workers, len(groups))
+    if workers <= 1:
+        results = [_dcmtk_dump_metadata_group(dcmdump, group) for group in groups]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="metadata") as pool:
+            results = list(pool.map(lambda group: _dcmtk_dump_metadata_group(dcmdump, group), groups))
+    for group_out, group_retry in results:
+        out.update(group_out)
+        retry.extend(group_retry)
+    return out, retry
+
+
+_HEX_DIGITS = frozenset("0123456789ABCDEFabcdef")
+
+
+# ASCII-only lower-casing keeps every index valid on the original line (str.lower may not).
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def _ascii_lower(line: str) -> str:
+    return line.lower() if line.isascii() else line.translate(_ASCII_LOWER)
+
+
+def _dcm4che_status_token(line: str, folded: str, start: int) -> str:
+    # "status=0H" / "STATUS=A700h": hex digits followed by H, keyword matched case-insensitively
+    # on the folded line; the token keeps the original case.
+    pos = folded.find("status=", start)
+    while pos >= 0:
+        tail = line[pos + 7 : pos + 23]
+        end = 0
+        while end < len(tail) and tail[end] in _HEX_DIGITS:
+            end += 1
+        if 0 < end < len(tail) and tail[end] in "Hh":
+            return tail[: end + 1]
+        pos = folded.find("status=", pos + 7)
+    return ""
+
+
+def _dcm4che_iuid_token(line: str, folded: str, start: int) -> str:
+    # "iuid=1.2.3 - ?": dotted numeric UID followed by whitespace and "-".
+    pos = folded.find("iuid=", start)
+    while pos >= 0:
+        pieces = line[pos + 5 :].split(None, 1)
+        if len(pieces) == 2 and pieces[1].startswith("-") and not line[pos + 5 : pos + 6].isspace():
+            token = pieces[0]
+            parts = token.split(".")
+            if len(parts) >= 2 and all(p.isascii() and p.isdigit() for p in parts):
+                return token
+        pos = folded.find("iuid=", pos + 5)
+    return ""
+
+
+class Dcm4cheStoreEventParser:
+    """
+    Incremental parser for dcm4che storescu C-STORE dumps.
+
+    A "<< n:C-STORE-RQ[" or ">> n:C-STORE-RSP[" header opens a message; the first iuid= that
+    follows closes it (status= is read in between for responses). feed() returns
+    ("RQ", iuid, ""), ("RSP_OK", iuid, "0H"), ("RSP_ERR", iuid, status) or None.
+    """
+
+    def __init__(self):
+        self._kind = ""
+        self._status = ""
+
+    def feed(self, line: str) -> tuple[str, str, str] | None:
+        pos = 0
+        folded = _ascii_lower(line)
+        # Header regex is case-insensitive; prefilter on the folded line so it agrees.
+        if "store-r" in folded:
+            m_head = DCM4CHE_STORE_HEADER_RE.search(line)
+            if m_head:
+                self._kind = "RQ" if m_head.group(2).upper() == "RQ" else "RSP"
+                self._status = ""
+                pos = m_head.end()
+        if not self._kind:
+            return None
+        if self._kind == "RSP" and not self._status:
+            self._status = _dcm4che_status_token(line, folded, pos)
+        iuid = _dcm4che_iuid_token(line, folded, pos)
+        if not iuid:
+            return None
+        kind, status = self._kind, self._status
+        self._kind = ""
+        self._status = ""
+        if kind == "RQ":
+            return "RQ", iuid, ""
+        if not status:
+            return None
+        if status.upper() == "0H":
+            return "RSP_OK", iuid, status
+        return "RSP_ERR", iuid, status
+
+
+class Dcm4cheSendOutputParser:
+    """Collects C-STORE request/response IUIDs line by line into the "__batch__" result."""
+
+    def __init__(self):
+        self._events = Dcm4cheStoreEventParser()
+        self.rq_iuids: list[str] = []
+        self.ok_iuids: list[str] = []
+        self.err_iuids: list[str] = []
+        self.err_status_by_iuid: dict[str, str] = {}
+
+    def feed(self, line: str) -> None:
+        event = self._events.feed(line)
+        if event is None:
+            return
+        kind, iuid, status = event
+        if kind == "RQ":
+            self.rq_iuids.append(iuid)
+        elif kind == "RSP_OK":
+            self.ok_iuids.append(iuid)
+        else:
+            self.err_iuids.append(iuid)
+            self.err_status_by_iuid[iuid] = status
+
+    def result(self) -> dict[str, dict]:
+        return {
+            "__batch__": {
+                "rq_iuids": self.rq_iuids,
+                "ok_iuids": self.ok_iuids,
+                "err_iuids": self.err_iuids,
+                "err_status_by_iuid": self.err_status_by_iuid,
+            }
+        }
 
 
 class Dcm4cheDriver(ToolkitDriver):
@@ -103,7 +371,11 @@ class Dcm4cheDriver(ToolkitDriver):
         storescu = Path(cfg.dcm4che_bin_path) / "storescu.bat"
         if not storescu.exists():
             raise RuntimeError(f"storescu.bat nao encontrado: {storescu}")
-        return ["cmd", "/c", str(storescu), "-c", f"{cfg.aet_destino}@{cfg.pacs_host}:{cfg.pacs_port}"]
+        base = [str(storescu), "-c", f"{cfg.aet_destino}@{cfg.pacs_host}:{cfg.pacs_port}"]
+        if cfg.dcm4che_use_shell_wrapper:
+            return ["cmd", "/c", *base]
+        # Same as storescu_cmd: without the wrapper the echo costs one process fewer.
+        return base
 
     def extract_metadata(self, cfg: AppConfig, file_path: Path) -> tuple[str, str, str, str]:
         if not cfg.dcm4che_bin_path:
@@ -111,28 +383,103 @@ class Dcm4cheDriver(ToolkitDriver):
         dcmdump = Path(cfg.dcm4che_bin_path) / "dcmdump.bat"
         if not dcmdump.exists():
             return "", "", "", "dcmdump.bat nao encontrado"
-        out = self.dcmdump_text(["cmd", "/c", str(dcmdump), str(file_path)])
+        cmd = [str(dcmdump), str(file_path)]
+        if cfg.dcm4che_use_shell_wrapper:
+            cmd = ["cmd", "/c", *cmd]
+        out = self.dcmdump_text(cmd)
         iuid_m = UID_TAG_0008_0018.search(out)
         ts_m = UID_TAG_0002_0010.search(out)
         iuid = normalize_uid_candidate(iuid_m.group(1) if iuid_m else "")
         ts_uid = normalize_uid_candidate(ts_m.group(1) if ts_m else "")
         return iuid, ts_uid, ts_uid, ""
 
-    def parse_send_output(self, lines: list[str], batch_files: list[Path]) -> dict[str, dict]:
-        blob = "\n".join(lines)
-        rq_iuids = [x.strip() for x in DCM4CHE_STORE_RQ_RE.findall(blob) if x.strip()]
-        ok_iuids = [x.strip() for x in DCM4CHE_STORE_RSP_OK_RE.findall(blob) if x.strip()]
-        err_matches = DCM4CHE_STORE_RSP_ERR_RE.findall(blob)
-        err_iuids = [uid.strip() for _status, uid in err_matches if uid.strip()]
-        err_status_by_iuid = {uid.strip(): status.strip() for status, uid in err_matches if uid.strip()}
-        return {
-            "__batch__": {
-                "rq_iuids": rq_iuids,
-                "ok_iuids": ok_iuids,
-                "err_iuids": err_iuids,
-                "err_status_by_iuid": err_status_by_iuid,
+    def extract_metadata_batch(self, cfg: AppConfig, files: list[Path]) -> MetadataBatchResult:
+        # dcm4che dcmdump takes a single file and starts a JVM per call; the bundled DCMTK
+        # dcmdump reads the same two tags for the whole batch when present.
+        return self._extract_metadata_grouped(cfg, files)
+
+    def send_output_parser(self, batch_files: list[Path]) -> Dcm4cheSendOutputParser:
+        return Dcm4cheSendOutputParser()
+
+
+class DcmtkSendOutputParser:
+    """Line-by-line storescu -v parser; result() maps file path -> send_status/status_detail."""
+
+    def __init__(self, batch_files: list[Path]):
+        self._batch_files = batch_files
+        self._result: dict[str, dict] = {}
+        self._current_file = ""
+        self._pending_failed_file = ""
+
+    def feed(self, raw_line: str) -> None:
+        # storescu -v lines carry a level prefix; only "I:" and "E:" lines can match below.
+        line = raw_line.lstrip()
+        head = line[:2]
+        if head == "I:":
+            m_file = DCMTK_SENDING_FILE_RE.match(line)
+            if m_file:
+                self._current_file = m_file.group(1).strip()
+                self._result.setdefault(
+                    self._current_file,
+                    {"send_status": "SENT_UNKNOWN", "status_detail": "File sending initiated; awaiting response"},
+                )
+                self._pending_failed_file = ""
+                return
+            m_rsp = DCMTK_STORE_RSP_RE.match(line)
+            if m_rsp and self._current_file:
+                detail = m_rsp.group(1).strip()
+                status = "SENT_OK" if "Success" in detail else "SEND_FAIL"
+                if ("Unknown Status: 0x110" in detail) and Path(self._current_file).name.upper() == "DICOMDIR":
+                    status = "UNSUPPORTED_DICOM_OBJECT"
+                self._result[self._current_file] = {"send_status": status, "status_detail": detail}
+                self._pending_failed_file = ""
+            return
+        if head != "E:":
+            return
+        bad_file, detail = parse_dcmtk_bad_dicom_line(line)
+        if bad_file:
+            detail = detail or "Bad DICOM file"
+            self._result[bad_file] = {"send_status": "SEND_FAIL", "status_detail": f"bad_dicom|{detail}"}
+            self._pending_failed_file = ""
+            return
+        m_no_sop = DCMTK_NO_SOP_UID_RE.match(line)
+        if m_no_sop:
+            bad_file = m_no_sop.group(1).strip()
+            self._result[bad_file] = {
+                "send_status": "SENT_UNKNOWN",
+                "status_detail": "No SOP Class or Instance UID in file",
             }
-        }
+            self._pending_failed_file = ""
+            self._current_file = bad_file
+            return
+        m_failed_file = DCMTK_STORE_FAILED_FILE_RE.match(line)
+        if m_failed_file:
+            self._pending_failed_file = m_failed_file.group(1).strip()
+            self._result[self._pending_failed_file] = {
+                "send_status": "SENT_UNKNOWN",
+                "status_detail": "Store failed; awaiting reason line",
+            }
+            self._current_file = self._pending_failed_file
+            return
+        m_failed_reason = DCMTK_STORE_FAILED_REASON_RE.match(line)
+        if m_failed_reason and self._pending_failed_file:
+            detail = m_failed_reason.group(1).strip()
+            self._result[self._pending_failed_file] = {
+                "send_status": "SENT_UNKNOWN",
+                "status_detail": detail,
+            }
+            self._pending_failed_file = ""
+
+    def result(self) -> dict[str, dict]:
+        for p in self._batch_files:
+            self._result.setdefault(
+                str(p),
+                {
+                    "send_status": "SENT_UNKNOWN",
+                    "status_detail": "parse_status=UNKNOWN;reason=no_match_in_output",
+                },
+            )
+        return self._result
 
 
 class DcmtkDriver(ToolkitDriver):
@@ -184,75 +531,16 @@ class DcmtkDriver(ToolkitDriver):
         ts_uid = normalize_uid_candidate(ts_m.group(1) if ts_m else "")
         return iuid, ts_uid, ts_uid, ""
 
-    def parse_send_output(self, lines: list[str], batch_files: list[Path]) -> dict[str, dict]:
-        result: dict[str, dict] = {}
-        current_file = ""
-        pending_failed_file = ""
-        for line in lines:
-            m_file = DCMTK_SENDING_FILE_RE.search(line)
-            if m_file:
-                current_file = m_file.group(1).strip()
-                result.setdefault(
-                    current_file,
-                    {"send_status": "SENT_UNKNOWN", "status_detail": "File sending initiated; awaiting response"},
-                )
-                pending_failed_file = ""
-                continue
-            bad_file, detail = parse_dcmtk_bad_dicom_line(line)
-            if bad_file:
-                detail = detail or "Bad DICOM file"
-                result[bad_file] = {"send_status": "SEND_FAIL", "status_detail": f"bad_dicom|{detail}"}
-                pending_failed_file = ""
-                continue
-            m_no_sop = DCMTK_NO_SOP_UID_RE.search(line)
-            if m_no_sop:
-                bad_file = m_no_sop.group(1).strip()
-                result[bad_file] = {
-                    "send_status": "SENT_UNKNOWN",
-                    "status_detail": "No SOP Class or Instance UID in file",
-                }
-                pending_failed_file = ""
-                current_file = bad_file
-                continue
-            m_failed_file = DCMTK_STORE_FAILED_FILE_RE.search(line)
-            if m_failed_file:
-                pending_failed_file = m_failed_file.group(1).strip()
-                result[pending_failed_file] = {
-                    "send_status": "SENT_UNKNOWN",
-                    "status_detail": "Store failed; awaiting reason line",
-                }
-                current_file = pending_failed_file
-                continue
-            m_failed_reason = DCMTK_STORE_FAILED_REASON_RE.search(line)
-            if m_failed_reason and pending_failed_file:
-                detail = m_failed_reason.group(1).strip()
-                result[pending_failed_file] = {
-                    "send_status": "SENT_UNKNOWN",
-                    "status_detail": detail,
-                }
-                pending_failed_file = ""
-                continue
-            m_rsp = DCMTK_STORE_RSP_RE.search(line)
-            if m_rsp and current_file:
-                detail = m_rsp.group(1).strip()
-                status = "SENT_OK" if "Success" in detail else "SEND_FAIL"
-                if ("Unknown Status: 0x110" in detail) and Path(current_file).name.upper() == "DICOMDIR":
-                    status = "UNSUPPORTED_DICOM_OBJECT"
-                result[current_file] = {"send_status": status, "status_detail": detail}
-                pending_failed_file = ""
-        for p in batch_files:
-            k = str(p)
-            result.setdefault(
-                k,
-                {
-                    "send_status": "SENT_UNKNOWN",
-                    "status_detail": "parse_status=UNKNOWN;reason=no_match_in_output",
-                },
-            )
-        return result
+    def extract_metadata_batch(self, cfg: AppConfig, files: list[Path]) -> MetadataBatchResult:
+        return self._extract_metadata_grouped(cfg, files)
 
+    def send_output_parser(self, batch_files: list[Path]) -> DcmtkSendOutputParser:
+        return DcmtkSendOutputParser(batch_files)
 
+
+@lru_cache(maxsize=8)
 def get_driver(toolkit: str) -> ToolkitDriver:
+    # Drivers are stateless (per-run parsers come from send_output_parser), so one instance per toolkit is shared.
     if toolkit == "dcmtk":
         return DcmtkDriver()
     return Dcm4cheDriver()
@@ -304,12 +592,14 @@ def inspect_dicomdir_candidate(cfg: AppConfig, file_path: Path) -> dict:
         if not dcmdump.exists():
             out["error"] = f"dcmdump.bat nao encontrado: {dcmdump}"
             return out
-        cmd = ["cmd", "/c", str(dcmdump), str(file_path)]
+        cmd = [str(dcmdump), str(file_path)]
+        if cfg.dcm4che_use_shell_wrapper:
+            cmd = ["cmd", "/c", *cmd]
 
     try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=30, check=False, **hidden_process_kwargs())
-        stdout = proc.stdout or ""
-        stderr = proc.stderr or ""
+        proc = subprocess.run(cmd, capture_output=True, timeout=30, check=False, **hidden_process_kwargs())
+        stdout = _decode_toolkit_output(proc.stdout)
+        stderr = _decode_toolkit_output(proc.stderr)
         out["dcmdump_returncode"] = str(proc.returncode)
         out["dcmdump_stdout_excerpt"] = stdout[:1200]
         out["dcmdump_stderr_excerpt"] = stderr[:1200]
@@ -3,7 +3,9 @@ import re
 import shlex
 import shutil
 import subprocess
+import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
 from app.config.settings import AppConfig
@@ -113,8 +115,20 @@ def now_iso() -> str:
     return datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
 
 
+# (epoch second, formatted value) of the last now_br() call.
+_NOW_BR_CACHE: tuple[int, str] = (-1, "")
+
+
 def now_br() -> str:
-    return datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+    # Second resolution: reuse the formatted value until the second changes.
+    global _NOW_BR_CACHE
+    sec = int(time.time())
+    cached_sec, cached_value = _NOW_BR_CACHE
+    if sec == cached_sec:
+        return cached_value
+    value = datetime.fromtimestamp(sec).strftime("%d/%m/%Y %H:%M:%S")
+    _NOW_BR_CACHE = (sec, value)
+    return value
 
 
 def now_dual_timestamp() -> tuple[str, str]:
@@ -127,7 +141,10 @@ def now_run_id() -> str:
 
 
 def sanitize_uid(value: str) -> str:
-    m = UID_VALUE_RE.search((value or "").strip())
+    # A UID has at least one dot; skip the regex for the (common) values that cannot match.
+    if not value or "." not in value:
+        return ""
+    m = UID_VALUE_RE.search(value.strip())
     return m.group(0).strip() if m else ""
 
 
@@ -137,14 +154,21 @@ def normalize_uid_candidate(value: str) -> str:
     return sanitize_uid(compact)
 
 
-def looks_like_dicom_payload_file(file_path: Path) -> bool:
-    name_up = file_path.name.upper()
-    if name_up == "DICOMDIR":
+_DICOM_PAYLOAD_EXTS = frozenset({".dcm", ".dicom", ".ima"})
+
+
+def looks_like_dicom_payload_file(file_path: Path | str) -> bool:
+    # Accepts str paths too, so hot loops do not need to build Path objects.
+    name = file_path.name if isinstance(file_path, Path) else os.path.basename(file_path)
+    if name.upper() == "DICOMDIR":
         return False
-    ext = file_path.suffix.lower()
-    if ext in [".dcm", ".dicom", ".ima"]:
+    # Same rule as Path.suffix: the dot must not be the first or the last character.
+    dot = name.rfind(".")
+    ext = name[dot:].lower() if 0 < dot < len(name) - 1 else ""
+    if ext in _DICOM_PAYLOAD_EXTS:
         return True
-    if not ext and sanitize_uid(file_path.name):
+    # A UID needs at least one dot; names without one never reach the regex.
+    if not ext and "." in name and sanitize_uid(name):
         return True
     return False
 
@@ -200,25 +224,17 @@ def toolkit_run_suffix(toolkit: str, dcm4che_send_mode: str = "MANIFEST_FILES")
     return re.sub(r"[^a-z0-9]+", "_", t).strip("_") or "toolkit"
 
 
+# Longest first, so "_dcm4che_folders" wins over "_dcm4che".
+_KNOWN_RUN_SUFFIXES = tuple(sorted(("_dcm4che_folders", "_dcm4che_files", "_dcm4che", "_dcmtk"), key=len, reverse=True))
+
+
 def strip_known_run_suffixes(run_id: str) -> str:
     base = (run_id or "").strip()
-    if not base:
-        return base
-    known_suffixes = [
-        "_dcm4che_folders",
-        "_dcm4che_files",
-        "_dcm4che",
-        "_dcmtk",
-    ]
-    changed = True
-    while changed:
-        changed = False
+    lower = base.lower()
+    while lower.endswith(_KNOWN_RUN_SUFFIXES):
+        suffix = next(s for s in _KNOWN_RUN_SUFFIXES if lower.endswith(s))
+        base = base[: -len(suffix)].rstrip("_")
         lower = base.lower()
-        for suffix in known_suffixes:
-            if lower.endswith(suffix):
-                base = base[: -len(suffix)].rstrip("_")
-                changed = True
-                break
     return base
 
 
@@ -253,6 +269,7 @@ class WorkflowCancelled(Exception):
     pass
 
 
+@lru_cache(maxsize=8)
 def read_app_version(base_dir: Path) -> str:
     candidates = [base_dir / "VERSION", base_dir.parent / "VERSION"]
     for p in candidates:
@@ -1,18 +1,25 @@
 import json
 import os
-import queue
 import subprocess
 import threading
 import time
 import tkinter as tk
-from dataclasses import asdict
+from collections import Counter, deque
+from dataclasses import replace
+from functools import lru_cache, partial
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 
-from app.config.settings import AppConfig
+from app.config.settings import APP_CONFIG_FIELDS, AppConfig
 from app.domain.constants import APP_DISPLAY_NAME
-from app.infra.run_artifacts import read_csv_rows, resolve_run_artifact_path, run_artifact_variants
-from app.integrations.toolkit_drivers import apply_internal_toolkit_paths, find_toolkit_bin, get_driver
+from app.infra.run_artifacts import (
+    iter_csv_rows,
+    read_csv_rows,
+    read_json_artifact,
+    resolve_run_artifact_path,
+    run_artifact_variants,
+)
+from app.integrations.toolkit_drivers import apply_internal_toolkit_paths, get_driver
 from app.shared.utils import (
     format_duration_sec,
     hidden_process_kwargs,
@@ -29,6 +36,123 @@ from app.workflows.send import SendWorkflow
 from app.workflows.validation import ValidationWorkflow
 
 
+# Log line classification rules in priority order: (tag, markers, anchored at line start).
+# Markers are matched against the stripped, upper-cased line; the first matching rule wins.
+_LOG_TAG_RULES: tuple[tuple[str, tuple[str, ...], bool], ...] = (
+    ("log_success", ("[AN_END]", "[AN_RESULT]", "[SEND_RESULT]", "[VAL_END]", "[VAL_RESULT]", "[REPORT_EXPORT]"), False),
+    (
+        "log_system",
+        (
+            "[AN_START]",
+            "[SEND_CONFIG]",
+            "[SEND_START]",
+            "[CHUNK_START]",
+            "[CHUNK_END]",
+            "[SEND_END]",
+            "[VAL_START]",
+            "[CFG_SAVE]",
+            "[SEND_PARSE_UID_EMPTY_EXPECTED]",
+            "[REPORT_START]",
+        ),
+        False,
+    ),
+    # Toolkit prefixes (dcmtk/dcm4che): E:/F: represent hard errors.
+    ("log_error", ("E:", "F:", "SEVERE:"), True),
+    (
+        "log_error",
+        (
+            "BAD DICOM FILE",
+            "FAILED TO ADD DATA SET FROM FILE",
+            "FAILED TO SEND DATA SET",
+            "NO PRESENTATION CONTEXT",
+            "STORE RESPONSE (STATUS: A7",
+            "STORE RESPONSE (STATUS: A9",
+            "STORE RESPONSE (STATUS: C",
+        ),
+        False,
+    ),
+    # Toolkit warnings should be visible in warn/error filter.
+    ("log_warn", ("W:", "WARNING:"), True),
+    ("log_error", ("[ERRO]", "[ERROR]", "TRACEBACK", "EXCEPTION", "RUNTIMEERROR"), False),
+    ("log_warn", ("[WARN", " WARN ", "PASS_WITH_WARNINGS", "SEND_PARSE_", "[SEND_WARN_SUMMARY]", "SENT_UNKNOWN"), False),
+    (
+        "log_success",
+        (
+            "STATUS: PASS",
+            "STATUS FINAL: PASS",
+            "VALIDACAO FINALIZADA",
+            "SEND FINALIZADO",
+            "ANALISE FINALIZADA",
+            "[REPORT_EXPORT]",
+        ),
+        False,
+    ),
+)
+
+
+def _marker_guard_char(markers: tuple[str, ...]) -> str:
+    # A delimiter every marker contains: a line without it cannot match the rule.
+    common = set(markers[0]).intersection(*markers[1:])
+    return next((ch for ch in "[:(" if ch in common), "")
+
+
+# _LOG_TAG_RULES plus the guard character checked before scanning each marker.
+_LOG_TAG_RULES_GUARDED: tuple[tuple[str, tuple[str, ...], bool, str], ...] = tuple(
+    (tag, markers, anchored, "" if anchored else _marker_guard_char(markers))
+    for tag, markers, anchored in _LOG_TAG_RULES
+)
+
+# Bracketed markers of the leading rules, by exact tag text (first rule wins).
+_LOG_HEAD_TAGS: dict[str, str] = {}
+for _tag, _markers, _anchored in _LOG_TAG_RULES[:2]:
+    for _marker in _markers:
+        _LOG_HEAD_TAGS.setdefault(_marker, _tag)
+del _tag, _markers, _anchored, _marker
+
+# Toolkit and workflow logs repeat the same lines (warnings, status templates) many times per run.
+@lru_cache(maxsize=4096)
+def _classify_log_tag(text: str) -> str:
+    line = (text or "").strip()
+    if not line:
+        return ""
+    up = line.upper()
+    if up.startswith("[") and up.find("[", 1) < 0:
+        # Every marker of the leading rules starts with "[": with a single bracket they can only
+        # match as the line's own tag, so one dict lookup settles them.
+        head_tag = _LOG_HEAD_TAGS.get(up[: up.find("]") + 1])
+        if head_tag:
+            return head_tag
+    for tag, markers, anchored, guard in _LOG_TAG_RULES_GUARDED:
+        if anchored:
+            if up.startswith(markers):
+                return tag
+            continue
+        if guard and guard not in up:
+            continue
+        for marker in markers:
+            if marker in up:
+                return tag
+    if line.startswith("[") and "]" in line:
+        return "log_system"
+    return ""
+
+
+# Tag/source groups shared by classification, tail de-duplication and the panel filters.
+_LOG_WARN_ERROR_TAGS = frozenset({"log_warn", "log_error"})
+# Lines the live send stream already delivers; the toolkit tail skips them.
+_LOG_STREAM_AUTHORITATIVE_TAGS = frozenset({"log_system", "log_warn", "log_error"})
+_SEND_TOOLKIT_RAW_SOURCES = frozenset({"toolkit", "toolkit_tail"})
+_LOG_FILTERED_MODES = frozenset({"Sistema", "Warnings + Erros"})
+# Worker log events -> (panel, source).
+_LOG_EVENT_TARGETS: dict[str, tuple[str, str]] = {
+    "an_log": ("an", "internal"),
+    "send_log": ("send", "internal"),
+    "send_log_internal": ("send", "internal"),
+    "send_log_toolkit": ("send", "toolkit_stream"),
+    "val_log": ("val", "internal"),
+}
+
+
 class _SimpleTooltip:
     def __init__(self, widget: tk.Widget, text: str):
         self.widget = widget
@@ -71,8 +195,12 @@ class App(tk.Tk):
         self.title(f"{APP_DISPLAY_NAME} - {self.app_version}")
         self.geometry("1180x760")
         self.config_file = self.base_dir / "app_config.json"
+        self._config_write_lock = threading.Lock()
+        self._config_write_seq = 0
         self.config_obj = self._load_config()
-        self.queue: queue.Queue = queue.Queue()
+        # Worker -> UI events. deque append/popleft are atomic, so producers never take a lock;
+        # _poll_queue on the Tk thread is the only consumer.
+        self.queue: deque[tuple[str, object]] = deque()
         self.worker_thread: threading.Thread | None = None
         self.cancel_event = threading.Event()
         self._active_send_workflow: SendWorkflow | None = None
@@ -86,27 +214,52 @@ class App(tk.Tk):
         self._send_tail_interval_ms = 250
         self._send_tail_backfill_lines = 150
         self._send_tail_max_lines_per_cycle = 300
+        self._run_list_refresh_min_interval_sec = 0.5
+        self._run_list_refreshed_at = 0.0
+        self._run_list_refresh_after_id: str | None = None
 
-        self.progress_items_var = tk.StringVar(value="enviando item 0 de 0")
-        self.progress_chunks_var = tk.StringVar(value="batch chunk 0 de 0 | retomada: nao")
+        # Items and chunk lines share one variable/label: one trace and one relayout per update.
+        self.progress_send_var = tk.StringVar(value=self._format_send_progress(0, 0, 0, 0, False, ""))
         self.analysis_progress_var = tk.StringVar(value="progresso analise: aguardando")
         self.log_filter_options = ["Todos", "Sistema", "Warnings + Erros"]
         self.var_log_filter_an = tk.StringVar(value="Todos")
         self.var_log_filter_send = tk.StringVar(value="Todos")
         self.var_log_filter_val = tk.StringVar(value="Todos")
+        # Send/validation tab state lives here: those tabs are built on first visit,
+        # but workflows and run selection read these variables from the start.
+        self.var_send_run = tk.StringVar()
+        self.var_show_send_internal = tk.BooleanVar(value=True)
+        self.var_show_output = tk.BooleanVar(value=False)
+        self.var_val_run = tk.StringVar()
+        self.var_report_mode = tk.StringVar(value="A - por arquivo")
+        self.cmb_send_runs: ttk.Combobox | None = None
+        self.cmb_val_runs: ttk.Combobox | None = None
+        self.lst_runs: ttk.Treeview | None = None
+        self._runs_list_page_size = 200
+        self._runs_list_shown = 0
+        self._run_list_values: tuple[list[str], list[str]] = ([], [])
+        # Run folders already known to hold analysis artifacts (an analysis is never undone).
+        self._run_dirs_with_analysis: set[str] = set()
         self._max_log_buffer_lines = 6000
         self._max_toolkit_log_buffer_lines = 800
-        self._log_refresh_batch_size = 300
-        self._log_filter_debounce_ms = 180
-        self._log_buffers: dict[str, list[tuple[str, str, str]]] = {"an": [], "send": [], "val": []}
-        self._log_toolkit_counts: dict[str, int] = {"an": 0, "send": 0, "val": 0}
-        self._log_buffer_versions: dict[str, int] = {"an": 0, "send": 0, "val": 0}
+        # Bounded per panel: appending past the limit evicts the oldest line.
+        self._log_buffers: dict[str, deque[tuple[str, str, str]]] = {
+            panel: deque(maxlen=self._max_log_buffer_lines) for panel in ("an", "send", "val")
+        }
+        self._log_toolkit_counts: Counter[str] = Counter({"an": 0, "send": 0, "val": 0})
         self._log_widgets: dict[str, tk.Text] = {}
-        self._log_refresh_tokens: dict[str, int] = {"an": 0, "send": 0, "val": 0}
-        self._log_refresh_after_ids: dict[str, str | None] = {"an": None, "send": None, "val": None}
-        self._log_render_after_ids: dict[str, str | None] = {"an": None, "send": None, "val": None}
-        self._log_render_state: dict[str, dict] = {}
-        self._log_filter_cache: dict[tuple, list[tuple[str, str, str]]] = {}
+        # Lines waiting for the next widget flush, per panel: (text, tags).
+        self._log_widget_pending: dict[str, list[tuple[str, tuple[str, ...]]]] = {"an": [], "send": [], "val": []}
+        self._log_widget_flush_after_id: str | None = None
+        self._log_widget_line_counts: Counter[str] = Counter()
+        self._log_widget_tags_cache: dict[tuple[str, str], tuple[str, ...]] = {}
+        self._log_view_elided: dict[str, dict[str, bool]] = {}
+        self._poll_queue_max_drain = 2000
+        # Poll interval by load: events drained this tick -> next delay (ms).
+        self._poll_queue_busy_threshold = 32
+        self._poll_queue_busy_ms = 16
+        self._poll_queue_active_ms = 60
+        self._poll_queue_idle_ms = 250
         self.activity_status_an = tk.StringVar(value="ocioso")
         self.activity_status_send = tk.StringVar(value="ocioso")
         self.activity_status_val = tk.StringVar(value="ocioso")
@@ -131,16 +284,13 @@ class App(tk.Tk):
         self.protocol("WM_DELETE_WINDOW", self._on_close_requested)
 
     def _load_config(self) -> AppConfig:
-        dcm4che_bin = find_toolkit_bin(self.base_dir, "dcm4che", "storescu.bat")
-        dcmtk_bin = find_toolkit_bin(self.base_dir, "dcmtk", "storescu.exe")
-        cfg = AppConfig(
-            dcm4che_bin_path=dcm4che_bin,
-            dcmtk_bin_path=dcmtk_bin,
-        )
+        # Toolkit paths are resolved once by apply_internal_toolkit_paths below.
+        cfg = AppConfig()
         if self.config_file.exists():
             try:
-                raw = json.loads(self.config_file.read_text(encoding="utf-8"))
-                cfg = AppConfig(**{**asdict(cfg), **raw})
+                # json.loads detects the encoding (and a UTF-8 BOM) from the bytes; no str decode pass.
+                raw = json.loads(self.config_file.read_bytes())
+                cfg = replace(cfg, **{k: v for k, v in raw.items() if k in APP_CONFIG_FIELDS})
             except Exception:
                 pass
         if cfg.aet_origem.strip().upper() == "STORESCU":
@@ -161,11 +311,52 @@ class App(tk.Tk):
             cfg.validation_parallel_requests = min(5, max(1, int(getattr(cfg, "validation_parallel_requests", 2))))
         except Exception:
             cfg.validation_parallel_requests = 2
+        try:
+            cfg.scan_workers = min(16, max(1, int(getattr(cfg, "scan_workers", AppConfig.scan_workers))))
+        except Exception:
+            cfg.scan_workers = AppConfig.scan_workers
+        try:
+            cfg.metadata_workers = min(16, max(1, int(getattr(cfg, "metadata_workers", AppConfig.metadata_workers))))
+        except Exception:
+            cfg.metadata_workers = AppConfig.metadata_workers
         raw_precheck = str(getattr(cfg, "send_precheck_before_send", False)).strip().lower()
         cfg.send_precheck_before_send = raw_precheck in {"1", "true", "yes", "on"}
         apply_internal_toolkit_paths(cfg, self.base_dir)
         return cfg
 
+    def _write_config_async(self, cfg: AppConfig) -> None:
+        # Serialize on the UI thread (cheap, consistent snapshot); disk write + swap off the Tk loop.
+        payload = json.dumps(
+            {name: getattr(cfg, name) for name in APP_CONFIG_FIELDS}, ensure_ascii=True, indent=2
+        ).encode("ascii")
+        self._config_write_seq += 1
+        # Non-daemon: a save issued right before closing still completes.
+        threading.Thread(target=self._write_config_file, args=(payload, self._config_write_seq)).start()
+
+    def _write_config_file(self, payload: bytes, seq: int) -> None:
+        with self._config_write_lock:
+            if seq != self._config_write_seq:
+                # A newer save is queued behind this one.
+                return
+            tmp_path = self.config_file.with_name(self.config_file.name + ".tmp")
+            try:
+                tmp_path.write_bytes(payload)
+                try:
+                    os.replace(tmp_path, self.config_file)
+                except OSError:
+                    # Windows refuses the swap while another handle has the file open; write in place.
+                    self.config_file.write_bytes(payload)
+                    try:
+                        tmp_path.unlink()
+                    except OSError:
+                        pass
+            except Exception as ex:
+                try:
+                    tmp_path.unlink()
+                except OSError:
+                    pass
+                self._enqueue_log("an_log", f"[WARN] Falha ao gravar {self.config_file.name}: {ex}")
+
     def _save_config(self, cfg: AppConfig):
         prev_toolkit = (self.config_obj.toolkit or "").strip().lower()
         prev_mode = normalize_dcm4che_send_mode(self.config_obj.dcm4che_send_mode)
@@ -176,7 +367,7 @@ class App(tk.Tk):
         # Config dialog does not expose toolkit paths; always re-resolve before persisting.
         apply_internal_toolkit_paths(cfg, self.base_dir)
         self.config_obj = cfg
-        self.config_file.write_text(json.dumps(asdict(cfg), ensure_ascii=True, indent=2), encoding="utf-8")
+        self._write_config_async(cfg)
         self.var_batch_size.set(str(cfg.batch_size_default))
         self._batch_size_max_cmd_limit = None
         self._batch_size_max_cmd_source = ""
@@ -187,6 +378,7 @@ class App(tk.Tk):
             f"batch={cfg.batch_size_default} restrict_extensions={'ON' if cfg.restrict_extensions else 'OFF'} "
             f"include_no_extension={'ON' if cfg.include_no_extension else 'OFF'} "
             f"collect_size_bytes={'ON' if cfg.collect_size_bytes else 'OFF'} "
+            f"scan_workers={cfg.scan_workers} "
             f"dcm4che_send_mode={cfg.dcm4che_send_mode} "
             f"dcm4che_iuid_update_mode={cfg.dcm4che_iuid_update_mode} "
             f"storescu_log_rotate_max_mb={cfg.storescu_log_rotate_max_mb} "
@@ -230,9 +422,19 @@ class App(tk.Tk):
         self.nb.add(self.tab_val, text="Validacao")
         self.nb.add(self.tab_runs, text="Runs")
         self._build_analyze_tab()
-        self._build_send_tab()
-        self._build_validation_tab()
-        self._build_runs_tab()
+        # Other tabs are built on first visit (notebook tab id -> builder).
+        self._tab_builders = {
+            str(self.tab_send): self._build_send_tab,
+            str(self.tab_val): self._build_validation_tab,
+            str(self.tab_runs): self._build_runs_tab,
+        }
+        self.nb.bind("<<NotebookTabChanged>>", self._on_notebook_tab_changed)
+        self._refresh_run_list()
+
+    def _on_notebook_tab_changed(self, _event=None) -> None:
+        builder = self._tab_builders.pop(self.nb.select(), None)
+        if builder is not None:
+            builder()
 
     def _setup_ui_styles(self) -> None:
         style = ttk.Style(self)
@@ -293,7 +495,7 @@ class App(tk.Tk):
             state="readonly",
         )
         cmb_filter_an.pack(side="left", padx=(8, 0))
-        cmb_filter_an.bind("<<ComboboxSelected>>", lambda _e: self._on_log_filter_changed("an"))
+        cmb_filter_an.bind("<<ComboboxSelected>>", partial(self._on_log_filter_changed, "an"))
 
         log_frame = ttk.Frame(self.tab_an, padding=(10, 0, 10, 10))
         log_frame.pack(fill="both", expand=True)
@@ -302,31 +504,28 @@ class App(tk.Tk):
         y = ttk.Scrollbar(log_frame, orient="vertical", command=self.txt_an.yview)
         y.pack(side="right", fill="y")
         self.txt_an.configure(yscrollcommand=y.set)
-        self._setup_log_tags(self.txt_an)
-        self._log_widgets["an"] = self.txt_an
+        self._register_log_widget("an", self.txt_an)
 
     def _build_send_tab(self):
         top = ttk.Frame(self.tab_send, padding=10)
         top.pack(fill="x")
-        self.var_send_run = tk.StringVar()
-        self.var_show_send_internal = tk.BooleanVar(value=True)
-        self.var_show_output = tk.BooleanVar(value=False)
         ttk.Label(top, text="Run ID analisado").grid(row=0, column=0, sticky="w")
         self.cmb_send_runs = ttk.Combobox(top, textvariable=self.var_send_run, width=36)
         self.cmb_send_runs.grid(row=0, column=1, sticky="w", padx=6)
         self.cmb_send_runs.bind("<<ComboboxSelected>>", lambda _e: self._on_send_run_selected())
+        self.cmb_send_runs["values"] = self._run_list_values[1]
         ttk.Button(top, text="Atualizar", command=self._refresh_run_list).grid(row=0, column=2, padx=4)
         ttk.Checkbutton(
             top,
             text="Exibir mensagens internas do sistema",
             variable=self.var_show_send_internal,
-            command=lambda: self._on_log_filter_changed("send"),
+            command=partial(self._on_log_filter_changed, "send"),
         ).grid(row=1, column=1, sticky="w", padx=6)
         ttk.Checkbutton(
             top,
             text="Exibir output bruto da toolkit (tempo real)",
             variable=self.var_show_output,
-            command=lambda: self._on_log_filter_changed("send"),
+            command=partial(self._on_log_filter_changed, "send"),
         ).grid(row=2, column=1, sticky="w", padx=6)
         ttk.Label(
             top,
@@ -343,8 +542,7 @@ class App(tk.Tk):
 
         prog = ttk.LabelFrame(status_row, text="Progresso", padding=10)
         prog.pack(side="left", fill="x", expand=True, padx=(0, 8))
-        ttk.Label(prog, textvariable=self.progress_items_var).pack(anchor="w")
-        ttk.Label(prog, textvariable=self.progress_chunks_var).pack(anchor="w")
+        ttk.Label(prog, textvariable=self.progress_send_var, justify="left").pack(anchor="w")
 
         side_panel = ttk.LabelFrame(status_row, text="Atividade e Filtros", padding=10)
         side_panel.pack(side="left", fill="y")
@@ -360,6 +558,8 @@ class App(tk.Tk):
         )
         self.pb_activity_send.pack(side="left")
         self._activity_bars.append(self.pb_activity_send)
+        if self._activity_running:
+            self.pb_activity_send.start(12)
 
         filter_bar = ttk.Frame(side_panel)
         filter_bar.pack(fill="x", pady=(8, 0))
@@ -372,7 +572,7 @@ class App(tk.Tk):
             state="readonly",
         )
         cmb_filter_send.pack(side="left", padx=(8, 0))
-        cmb_filter_send.bind("<<ComboboxSelected>>", lambda _e: self._on_log_filter_changed("send"))
+        cmb_filter_send.bind("<<ComboboxSelected>>", partial(self._on_log_filter_changed, "send"))
 
         log_frame = ttk.Frame(self.tab_send, padding=(10, 0, 10, 10))
         log_frame.pack(fill="both", expand=True)
@@ -381,17 +581,15 @@ class App(tk.Tk):
         y = ttk.Scrollbar(log_frame, orient="vertical", command=self.txt_send.yview)
         y.pack(side="right", fill="y")
         self.txt_send.configure(yscrollcommand=y.set)
-        self._setup_log_tags(self.txt_send)
-        self._log_widgets["send"] = self.txt_send
+        self._register_log_widget("send", self.txt_send)
 
     def _build_validation_tab(self):
         top = ttk.Frame(self.tab_val, padding=10)
         top.pack(fill="x")
-        self.var_val_run = tk.StringVar()
-        self.var_report_mode = tk.StringVar(value="A - por arquivo")
         ttk.Label(top, text="Run ID").grid(row=0, column=0, sticky="w")
         self.cmb_val_runs = ttk.Combobox(top, textvariable=self.var_val_run, width=40)
         self.cmb_val_runs.grid(row=0, column=1, sticky="w", padx=6)
+        self.cmb_val_runs["values"] = self._run_list_values[0]
         ttk.Button(top, text="Atualizar", command=self._refresh_run_list).grid(row=0, column=2, padx=4)
         ttk.Button(top, text="Validar Run", command=self._start_validation).grid(row=0, column=3, padx=4)
         ttk.Button(top, text="Cancelar", command=self._cancel_current_job).grid(row=0, column=4, padx=4)
@@ -422,6 +620,8 @@ class App(tk.Tk):
         )
         self.pb_activity_val.pack(side="left")
         self._activity_bars.append(self.pb_activity_val)
+        if self._activity_running:
+            self.pb_activity_val.start(12)
         filter_bar = ttk.Frame(self.tab_val, padding=(10, 0, 10, 4))
         filter_bar.pack(fill="x")
         ttk.Label(filter_bar, text="Filtro de log (tela)").pack(side="left")
@@ -433,7 +633,7 @@ class App(tk.Tk):
             state="readonly",
         )
         cmb_filter_val.pack(side="left", padx=(8, 0))
-        cmb_filter_val.bind("<<ComboboxSelected>>", lambda _e: self._on_log_filter_changed("val"))
+        cmb_filter_val.bind("<<ComboboxSelected>>", partial(self._on_log_filter_changed, "val"))
         log_frame = ttk.Frame(self.tab_val, padding=(10, 0, 10, 10))
         log_frame.pack(fill="both", expand=True)
         self.txt_val = tk.Text(log_frame, wrap="none")
@@ -441,8 +641,7 @@ class App(tk.Tk):
         y = ttk.Scrollbar(log_frame, orient="vertical", command=self.txt_val.yview)
         y.pack(side="right", fill="y")
         self.txt_val.configure(yscrollcommand=y.set)
-        self._setup_log_tags(self.txt_val)
-        self._log_widgets["val"] = self.txt_val
+        self._register_log_widget("val", self.txt_val)
 
     def _build_runs_tab(self):
         root = ttk.Frame(self.tab_runs, padding=10)
@@ -451,9 +650,32 @@ class App(tk.Tk):
         top.pack(fill="x")
         ttk.Button(top, text="Atualizar runs", command=self._refresh_run_list).pack(side="left", padx=4)
         ttk.Button(top, text="Abrir pasta selecionada", command=self._open_selected_run_folder).pack(side="left", padx=4)
-        self.lst_runs = tk.Listbox(root)
-        self.lst_runs.pack(fill="both", expand=True, pady=(8, 0))
-        self._refresh_run_list()
+        list_frame = ttk.Frame(root)
+        list_frame.pack(fill="both", expand=True, pady=(8, 0))
+        self.lst_runs = ttk.Treeview(list_frame, show="tree", selectmode="browse", height=25)
+        self.lst_runs.pack(side="left", fill="both", expand=True)
+        self._runs_list_scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.lst_runs.yview)
+        self._runs_list_scrollbar.pack(side="right", fill="y")
+        self.lst_runs.configure(yscrollcommand=self._on_runs_list_scrolled)
+        self._fill_runs_list()
+
+    def _fill_runs_list(self) -> None:
+        # Only the newest page is inserted; scrolling to the end loads the next one.
+        self.lst_runs.delete(*self.lst_runs.get_children())
+        self._runs_list_shown = 0
+        self._load_more_runs()
+
+    def _load_more_runs(self) -> None:
+        runs = self._run_list_values[0]
+        page = runs[self._runs_list_shown : self._runs_list_shown + self._runs_list_page_size]
+        for run_id in page:
+            self.lst_runs.insert("", "end", iid=run_id, text=run_id)
+        self._runs_list_shown += len(page)
+
+    def _on_runs_list_scrolled(self, first: str, last: str) -> None:
+        self._runs_list_scrollbar.set(first, last)
+        if float(last) >= 1.0 and self._runs_list_shown < len(self._run_list_values[0]):
+            self._load_more_runs()
 
     def _runs_base(self) -> Path:
         if self.config_obj.runs_base_dir.strip():
@@ -477,24 +699,53 @@ class App(tk.Tk):
         return False
 
     def _refresh_run_list(self):
+        # Coalesce bursts (buttons, menu, workflow completion) into one trailing scan.
+        elapsed = time.monotonic() - self._run_list_refreshed_at
+        if elapsed < self._run_list_refresh_min_interval_sec:
+            if self._run_list_refresh_after_id is None:
+                delay_ms = int((self._run_list_refresh_min_interval_sec - elapsed) * 1000) + 1
+                self._run_list_refresh_after_id = self.after(delay_ms, self._refresh_run_list_now)
+            return
+        self._refresh_run_list_now()
+
+    def _refresh_run_list_now(self):
+        if self._run_list_refresh_after_id is not None:
+            try:
+                self.after_cancel(self._run_list_refresh_after_id)
+            except Exception:
+                pass
+            self._run_list_refresh_after_id = None
+        self._run_list_refreshed_at = time.monotonic()
         runs_base = self._runs_base()
         runs_base.mkdir(parents=True, exist_ok=True)
-        runs = [p.name for p in runs_base.iterdir() if p.is_dir()]
-        runs.sort(reverse=True)
-        self.cmb_an_runs["values"] = runs
-        runs_with_analysis = [r for r in runs if self._run_has_analysis(r)]
-        self.cmb_send_runs["values"] = runs_with_analysis
-        self.cmb_val_runs["values"] = runs
-        self.lst_runs.delete(0, tk.END)
-        for r in runs:
-            self.lst_runs.insert(tk.END, r)
+        # DirEntry.is_dir() uses the type from the directory listing; no stat per run.
+        with os.scandir(runs_base) as it:
+            runs = sorted((entry.name for entry in it if entry.is_dir()), reverse=True)
+        # Only runs not yet seen with artifacts (new or still being analysed) are probed on disk.
+        run_dirs = {r: os.path.join(runs_base, r) for r in runs}
+        known = self._run_dirs_with_analysis
+        known.intersection_update(run_dirs.values())
+        for r, run_dir in run_dirs.items():
+            if run_dir not in known and self._run_has_analysis(r):
+                known.add(run_dir)
+        runs_with_analysis = [r for r in runs if run_dirs[r] in known]
+        if (runs, runs_with_analysis) != self._run_list_values:
+            # Kept for tabs not built yet (their builders apply it) and to skip unchanged refreshes.
+            self._run_list_values = (runs, runs_with_analysis)
+            self.cmb_an_runs["values"] = runs
+            if self.cmb_send_runs is not None:
+                self.cmb_send_runs["values"] = runs_with_analysis
+            if self.cmb_val_runs is not None:
+                self.cmb_val_runs["values"] = runs
+            if self.lst_runs is not None:
+                self._fill_runs_list()
         self._on_send_run_selected()
 
     def _open_selected_run_folder(self):
-        sel = self.lst_runs.curselection()
+        sel = self.lst_runs.selection()
         if not sel:
             return
-        run_id = self.lst_runs.get(sel[0])
+        run_id = sel[0]
         p = self._runs_base() / run_id
         if p.exists():
             os.startfile(str(p))
@@ -540,11 +791,8 @@ class App(tk.Tk):
         if int(self.config_obj.batch_size_default) == batch:
             return
         self.config_obj.batch_size_default = batch
-        try:
-            self.config_file.write_text(json.dumps(asdict(self.config_obj), ensure_ascii=True, indent=2), encoding="utf-8")
-            self._log_an(f"[CFG_BATCH_LAST_USED] batch_size_default atualizado para {batch}.")
-        except Exception as ex:
-            self._log_an(f"[WARN] Falha ao persistir batch_size_default={batch}: {ex}")
+        self._write_config_async(self.config_obj)
+        self._log_an(f"[CFG_BATCH_LAST_USED] batch_size_default atualizado para {batch}.")
 
     def _on_batch_size_changed(self, *_args) -> None:
         if self._batch_size_trace_guard:
@@ -594,7 +842,7 @@ class App(tk.Tk):
         if not manifest.exists():
             return set()
         selected: set[str] = set()
-        for row in read_csv_rows(manifest):
+        for row in iter_csv_rows(manifest):
             if str(row.get("selected_for_send", "0")).strip() != "1":
                 continue
             file_path = str(row.get("file_path", "")).strip()
@@ -618,7 +866,7 @@ class App(tk.Tk):
                     continue
                 has_checkpoint = True
                 try:
-                    payload = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+                    payload = read_json_artifact(checkpoint_path)
                 except Exception:
                     continue
                 if not isinstance(payload, dict):
@@ -635,7 +883,7 @@ class App(tk.Tk):
         if not send_results.exists():
             return False, 0
         processed_files: set[str] = set()
-        for row in read_csv_rows(send_results):
+        for row in iter_csv_rows(send_results):
             file_path = str(row.get("file_path", "")).strip()
             if not file_path:
                 continue
@@ -849,7 +1097,7 @@ class App(tk.Tk):
     def _refresh_validation_parallel_indicator(self, mode_context: str = "") -> None:
         parallel = self._current_validation_parallel_requests()
         context = f" | modo: {mode_context}" if mode_context else ""
-        self.validation_parallel_status_val.set(f"Consultas REST paralelas: {parallel}{context}")
+        self._set_var_if_changed(self.validation_parallel_status_val, f"Consultas REST paralelas: {parallel}{context}")
 
     def _validation_perf_snapshot_text(self) -> str:
         if not self._validation_perf_by_parallel:
@@ -882,8 +1130,9 @@ class App(tk.Tk):
         if not self._validation_timer_running:
             return
         elapsed = max(time.monotonic() - self._validation_timer_started_at, 0.0)
-        self.validation_timing_status_val.set(
-            f"Tempo validacao (em execucao): {format_duration_sec(elapsed)} | paralelo={self._validation_timer_parallel}"
+        self._set_var_if_changed(
+            self.validation_timing_status_val,
+            f"Tempo validacao (em execucao): {format_duration_sec(elapsed)} | paralelo={self._validation_timer_parallel}",
         )
 
     def _stop_validation_timer(self, *, status: str, duration_sec: float | None = None) -> None:
@@ -912,14 +1161,25 @@ class App(tk.Tk):
     def _set_activity_context(self, context: str) -> None:
         self._activity_context = (context or "").strip()
 
+    def _format_send_progress(
+        self, done: int, total: int, chunk_no: int, chunk_total: int, is_resuming: bool, resume_label: str
+    ) -> str:
+        resume = resume_label if is_resuming else "nao"
+        return f"enviando item {done} de {total}\nbatch chunk {chunk_no} de {chunk_total} | retomada: {resume}"
+
+    def _set_var_if_changed(self, var: tk.Variable, value) -> None:
+        # Each set() fires Tcl traces and a label redraw; skip writes that change nothing.
+        if var.get() != value:
+            var.set(value)
+
     def _set_activity_running(self, running: bool) -> None:
         if running:
             status = f"processando ({self._activity_context})..." if self._activity_context else "processando..."
         else:
             status = "ocioso"
-        self.activity_status_an.set(status)
-        self.activity_status_send.set(status)
-        self.activity_status_val.set(status)
+        self._set_var_if_changed(self.activity_status_an, status)
+        self._set_var_if_changed(self.activity_status_send, status)
+        self._set_var_if_changed(self.activity_status_val, status)
 
         if running and not self._activity_running:
             for bar in self._activity_bars:
@@ -978,16 +1238,16 @@ class App(tk.Tk):
             try:
                 wf = AnalyzeWorkflow(
                     self.config_obj,
-                    lambda m: self.queue.put(("an_log", m)),
+                    partial(self._enqueue_log, "an_log"),
                     self.cancel_event,
-                    lambda p: self.queue.put(("an_progress", p)),
+                    lambda p: self.queue.append(("an_progress", p)),
                 )
                 result = wf.run_analysis(exam_root=exam_root, batch_size=batch, run_id=run_id)
-                self.queue.put(("an_done", result))
+                self.queue.append(("an_done", result))
             except WorkflowCancelled as ex:
-                self.queue.put(("an_cancelled", str(ex)))
+                self.queue.append(("an_cancelled", str(ex)))
             except Exception as ex:
-                self.queue.put(("an_error", str(ex)))
+                self.queue.append(("an_error", str(ex)))
 
         self.worker_thread = threading.Thread(target=task, daemon=True)
         self.worker_thread.start()
@@ -1065,8 +1325,7 @@ class App(tk.Tk):
                 return
         self.cancel_event.clear()
         self._log_send("Iniciando envio...")
-        self.progress_items_var.set("enviando item 0 de 0")
-        self.progress_chunks_var.set("batch chunk 0 de 0 | retomada: nao")
+        self._set_var_if_changed(self.progress_send_var, self._format_send_progress(0, 0, 0, 0, False, ""))
         show_output = bool(self.var_show_output.get())
         self._set_activity_context("Send")
         self._set_activity_running(True)
@@ -1081,7 +1340,7 @@ class App(tk.Tk):
             is_resuming,
             resume_label,
         ):
-            self.queue.put(
+            self.queue.append(
                 (
                     "send_progress",
                     (
@@ -1102,16 +1361,16 @@ class App(tk.Tk):
             try:
                 wf = SendWorkflow(
                     self.config_obj,
-                    lambda m: self.queue.put(("send_log_internal", m)),
+                    partial(self._enqueue_log, "send_log_internal"),
                     self.cancel_event,
                     progress,
-                    toolkit_logger=lambda m: self.queue.put(("send_log_toolkit", m)),
+                    toolkit_logger=partial(self._enqueue_log, "send_log_toolkit"),
                 )
                 self._active_send_workflow = wf
                 result = wf.run_send(run_id=run_id, batch_size=batch, show_output=show_output)
-                self.queue.put(("send_done", result))
+                self.queue.append(("send_done", result))
             except Exception as ex:
-                self.queue.put(("send_error", str(ex)))
+                self.queue.append(("send_error", str(ex)))
             finally:
                 if self._active_send_workflow is wf:
                     self._active_send_workflow = None
@@ -1149,11 +1408,11 @@ class App(tk.Tk):
 
         def task():
             try:
-                wf = ValidationWorkflow(self.config_obj, lambda m: self.queue.put(("val_log", m)), self.cancel_event)
+                wf = ValidationWorkflow(self.config_obj, partial(self._enqueue_log, "val_log"), self.cancel_event)
                 result = wf.run_validation(run_id=run_id)
-                self.queue.put(("val_done", result))
+                self.queue.append(("val_done", result))
             except Exception as ex:
-                self.queue.put(("val_error", str(ex)))
+                self.queue.append(("val_error", str(ex)))
 
         self.worker_thread = threading.Thread(target=task, daemon=True)
         self.worker_thread.start()
@@ -1176,11 +1435,11 @@ class App(tk.Tk):
 
         def task():
             try:
-                wf = ValidationWorkflow(self.config_obj, lambda m: self.queue.put(("val_log", m)), self.cancel_event)
+                wf = ValidationWorkflow(self.config_obj, partial(self._enqueue_log, "val_log"), self.cancel_event)
                 result = wf.export_complete_report(run_id=run_id, report_mode=mode)
-                self.queue.put(("report_done", result))
+                self.queue.append(("report_done", result))
             except Exception as ex:
-                self.queue.put(("report_error", str(ex)))
+                self.queue.append(("report_error", str(ex)))
 
         self.worker_thread = threading.Thread(target=task, daemon=True)
         self.worker_thread.start()
@@ -1255,71 +1514,41 @@ class App(tk.Tk):
         widget.tag_configure("log_success", foreground="#146c2e")
         widget.tag_configure("log_system", foreground="#0052cc")
 
-    def _classify_log_tag(self, text: str) -> str:
-        line = (text or "").strip()
-        up = line.upper()
-        if not line:
-            return ""
-        if any(tag in up for tag in ["[AN_END]", "[AN_RESULT]", "[SEND_RESULT]", "[VAL_END]", "[VAL_RESULT]", "[REPORT_EXPORT]"]):
-            return "log_success"
-        if any(
-            tag in up
-            for tag in [
-                "[AN_START]",
-                "[SEND_CONFIG]",
-                "[SEND_START]",
-                "[CHUNK_START]",
-                "[CHUNK_END]",
-                "[SEND_END]",
-                "[VAL_START]",
-                "[CFG_SAVE]",
-                "[SEND_PARSE_UID_EMPTY_EXPECTED]",
-                "[REPORT_START]",
-            ]
-        ):
-            return "log_system"
-        # Toolkit prefixes (dcmtk/dcm4che): E:/F: represent hard errors.
-        if up.startswith("E:") or up.startswith("F:") or up.startswith("SEVERE:"):
-            return "log_error"
-        if any(
-            marker in up
-            for marker in [
-                "BAD DICOM FILE",
-                "FAILED TO ADD DATA SET FROM FILE",
-                "FAILED TO SEND DATA SET",
-                "NO PRESENTATION CONTEXT",
-                "STORE RESPONSE (STATUS: A7",
-                "STORE RESPONSE (STATUS: A9",
-                "STORE RESPONSE (STATUS: C",
-            ]
-        ):
-            return "log_error"
-        # Toolkit warnings should be visible in warn/error filter.
-        if up.startswith("W:") or up.startswith("WARNING:"):
-            return "log_warn"
-        if "[ERRO]" in up or "[ERROR]" in up or "TRACEBACK" in up or "EXCEPTION" in up or "RUNTIMEERROR" in up:
-            return "log_error"
-        if (
-            "[WARN" in up
-            or " WARN " in up
-            or "PASS_WITH_WARNINGS" in up
-            or "SEND_PARSE_" in up
-            or "[SEND_WARN_SUMMARY]" in up
-            or "SENT_UNKNOWN" in up
-        ):
-            return "log_warn"
-        if (
-            "STATUS: PASS" in up
-            or "STATUS FINAL: PASS" in up
-            or "VALIDACAO FINALIZADA" in up
-            or "SEND FINALIZADO" in up
-            or "ANALISE FINALIZADA" in up
-            or "[REPORT_EXPORT]" in up
-        ):
-            return "log_success"
-        if line.startswith("[") and "]" in line:
-            return "log_system"
-        return ""
+    def _register_log_widget(self, panel: str, widget: tk.Text) -> None:
+        self._setup_log_tags(widget)
+        self._log_widgets[panel] = widget
+        self._log_view_elided[panel] = {}
+        # Lines logged before the tab was built are only in the buffer.
+        buffered = [
+            (text, self._log_widget_tags(tag, source)) for text, tag, source in self._log_buffers.get(panel, ())
+        ]
+        self._append_widget_lines(panel, buffered, auto_scroll=False)
+        self._refresh_log_view(panel)
+
+    def _log_view_tag(self, tag: str, source: str) -> str:
+        # Every widget line carries one view tag; the panel filter hides lines by eliding these tags.
+        if tag == "log_system":
+            level = "system"
+        elif tag in _LOG_WARN_ERROR_TAGS:
+            level = "warnerr"
+        else:
+            level = "other"
+        if source == "internal":
+            origin = "internal"
+        elif self._is_send_toolkit_raw_source(source):
+            origin = "toolkit"
+        else:
+            origin = "stream"
+        return f"view_{level}_{origin}"
+
+    def _log_widget_tags(self, tag: str, source: str) -> tuple[str, ...]:
+        # Shared tuple per (tag, source): batching in _append_widget_lines compares runs by identity.
+        key = (tag, source)
+        tags = self._log_widget_tags_cache.get(key)
+        if tags is None:
+            view_tag = self._log_view_tag(tag, source)
+            tags = self._log_widget_tags_cache[key] = (tag, view_tag) if tag else (view_tag,)
+        return tags
 
     def _log_filter_mode(self, panel: str) -> str:
         if panel == "an":
@@ -1331,7 +1560,7 @@ class App(tk.Tk):
         return "Todos"
 
     def _is_send_toolkit_raw_source(self, source: str) -> bool:
-        return source in {"toolkit", "toolkit_tail"}
+        return source in _SEND_TOOLKIT_RAW_SOURCES
 
     def _send_tail_mode_enabled(self) -> bool:
         if (self._active_send_workflow is None) or (not self._worker_busy()):
@@ -1365,9 +1594,9 @@ class App(tk.Tk):
         return text.splitlines()[-max_lines:]
 
     def _append_send_tail_line(self, text: str) -> None:
-        tag = self._classify_log_tag(text)
+        tag = _classify_log_tag(text)
         # Stream channel is authoritative for system and warning/error lines.
-        if tag in {"log_system", "log_warn", "log_error"}:
+        if tag in _LOG_STREAM_AUTHORITATIVE_TAGS:
             return
         self._append_log_line("send", text, source="toolkit_tail")
 
@@ -1474,273 +1703,143 @@ class App(tk.Tk):
                 return False
             if self._is_send_toolkit_raw_source(source) and not show_send_toolkit:
                 return False
-            if mode in {"Sistema", "Warnings + Erros"} and self._is_send_toolkit_raw_source(source):
+            if mode in _LOG_FILTERED_MODES and source in _SEND_TOOLKIT_RAW_SOURCES:
                 return False
         if mode == "Todos":
             return True
         if mode == "Sistema":
             return tag == "log_system"
         if mode == "Warnings + Erros":
-            return tag in ["log_warn", "log_error"]
+            return tag in _LOG_WARN_ERROR_TAGS
         return True
 
-    def _line_matches_filter(self, panel: str, tag: str, source: str) -> bool:
-        return self._line_matches_filter_values(
-            panel,
-            tag,
-            source,
-            self._log_filter_mode(panel),
-            bool(self.var_show_send_internal.get()),
-            bool(self.var_show_output.get()),
-        )
-
-    def _append_widget_line(
+    def _append_widget_lines(
         self,
-        widget: tk.Text,
-        text: str,
-        tag: str,
+        panel: str,
+        lines: list[tuple[str, tuple[str, ...]]],
         *,
-        enforce_limit: bool = True,
         auto_scroll: bool = True,
     ) -> None:
-        if tag:
-            widget.insert("end", text + "\n", tag)
-        else:
-            widget.insert("end", text + "\n")
-        if enforce_limit:
-            line_count = int(widget.index("end-1c").split(".")[0])
-            if line_count > self._max_log_buffer_lines:
-                excess = line_count - self._max_log_buffer_lines
-                widget.delete("1.0", f"{excess + 1}.0")
+        widget = self._log_widgets.get(panel)
+        if widget is None or not lines:
+            return
+        # One insert call for the whole batch: consecutive lines with the same tags become one chunk.
+        insert_args: list[str | tuple[str, ...]] = []
+        run_texts: list[str] = []
+        run_tags = lines[0][1]
+        for text, tags in lines:
+            if tags is not run_tags:
+                insert_args.extend(("\n".join(run_texts) + "\n", run_tags))
+                run_texts = []
+                run_tags = tags
+            run_texts.append(text)
+        insert_args.extend(("\n".join(run_texts) + "\n", run_tags))
+        widget.insert("end", *insert_args)
+        # Line count is tracked here (chunks may hold multi-line messages), so trimming needs no
+        # widget.index() round-trip and costs at most one delete per flush.
+        line_count = self._log_widget_line_counts[panel] + sum(chunk.count("\n") for chunk in insert_args[::2])
+        if line_count > self._max_log_buffer_lines:
+            excess = line_count - self._max_log_buffer_lines
+            widget.delete("1.0", f"{excess + 1}.0")
+            line_count -= excess
+        self._log_widget_line_counts[panel] = line_count
         if auto_scroll:
             widget.see("end")
 
-    def _build_log_view_cache_key(self, panel: str, mode: str, show_send_internal: bool, show_send_toolkit: bool) -> tuple:
-        return (
-            panel,
-            mode,
-            show_send_internal if panel == "send" else True,
-            show_send_toolkit if panel == "send" else True,
-            self._log_buffer_versions.get(panel, 0),
-        )
-
     def _emit_log_refresh_marker(self, panel: str, message: str) -> None:
         print(message)
 
-    def _on_log_filter_changed(self, panel: str) -> None:
+    def _on_log_filter_changed(self, panel: str, _event=None) -> None:
         mode = self._log_filter_mode(panel)
         self._emit_log_refresh_marker(panel, f"[LOG_FILTER_CHANGE] panel={panel} mode={mode}")
-        self._schedule_log_refresh(panel, debounce_ms=self._log_filter_debounce_ms)
+        self._refresh_log_view(panel)
         if panel == "send":
             self._reconcile_send_tail_state()
 
-    def _schedule_log_refresh(self, panel: str, debounce_ms: int) -> None:
-        prev_after = self._log_refresh_after_ids.get(panel)
-        if prev_after:
-            try:
-                self.after_cancel(prev_after)
-            except Exception:
-                pass
-        self._log_refresh_after_ids[panel] = self.after(
-            max(debounce_ms, 0),
-            lambda: self._start_log_refresh(panel),
-        )
-
-    def _start_log_refresh(self, panel: str) -> None:
+    def _refresh_log_view(self, panel: str) -> None:
+        # The widget keeps every line; a filter change only toggles elide on the view tags.
         widget = self._log_widgets.get(panel)
         if widget is None:
             return
-        self._log_refresh_after_ids[panel] = None
-        token = self._log_refresh_tokens.get(panel, 0) + 1
-        self._log_refresh_tokens[panel] = token
         mode = self._log_filter_mode(panel)
-        show_send_internal = bool(self.var_show_send_internal.get())
-        show_send_toolkit = bool(self.var_show_output.get())
-        cache_key = self._build_log_view_cache_key(panel, mode, show_send_internal, show_send_toolkit)
-        cached = self._log_filter_cache.get(cache_key)
-        if cached is not None:
-            self._emit_log_refresh_marker(
-                panel,
-                f"[LOG_REFRESH_START] panel={panel} token={token} mode={mode} "
-                f"buffer={len(self._log_buffers.get(panel, []))} source=CACHE",
-            )
-            self._begin_log_refresh_render(panel, token, list(cached), build_duration_ms=0, source="CACHE")
-            return
-
-        snapshot = list(self._log_buffers.get(panel, []))
-        self._emit_log_refresh_marker(
-            panel,
-            f"[LOG_REFRESH_START] panel={panel} token={token} mode={mode} "
-            f"buffer={len(snapshot)} source=WORKER",
-        )
+        # Send-only toggles; the send tab is built after the analysis tab.
+        show_send_internal = bool(self.var_show_send_internal.get()) if panel == "send" else True
+        show_send_toolkit = bool(self.var_show_output.get()) if panel == "send" else True
+        elided = self._log_view_elided.setdefault(panel, {})
+        for tag in ("log_system", "log_warn", ""):
+            for source in ("internal", "toolkit", "toolkit_stream"):
+                hidden = not self._line_matches_filter_values(
+                    panel, tag, source, mode, show_send_internal, show_send_toolkit
+                )
+                view_tag = self._log_view_tag(tag, source)
+                # Changing elide re-lays out every line with the tag; skip tags that keep their state.
+                if elided.get(view_tag) is not hidden:
+                    widget.tag_configure(view_tag, elide=hidden)
+                    elided[view_tag] = hidden
+        widget.see("end")
 
-        worker = threading.Thread(
-            target=self._compute_log_refresh_snapshot,
-            args=(panel, token, snapshot, mode, show_send_internal, show_send_toolkit, cache_key),
-            daemon=True,
-        )
-        worker.start()
+    def _append_log_line(self, panel: str, text: str, source: str = "internal") -> None:
+        self._append_log_lines(panel, [text], source)
 
-    def _compute_log_refresh_snapshot(
-        self,
-        panel: str,
-        token: int,
-        snapshot: list[tuple[str, str, str]],
-        mode: str,
-        show_send_internal: bool,
-        show_send_toolkit: bool,
-        cache_key: tuple,
+    def _append_log_lines(
+        self, panel: str, texts: list[str | tuple[str, str]], source: str = "internal"
     ) -> None:
-        start = time.monotonic()
-        filtered: list[tuple[str, str, str]] = []
-        for text, tag, source in snapshot:
-            if self._line_matches_filter_values(panel, tag, source, mode, show_send_internal, show_send_toolkit):
-                filtered.append((text, tag, source))
-        elapsed_ms = int((time.monotonic() - start) * 1000)
-        self.queue.put(
-            (
-                "log_refresh_ready",
-                {
-                    "panel": panel,
-                    "token": token,
-                    "lines": filtered,
-                    "cache_key": cache_key,
-                    "build_duration_ms": elapsed_ms,
-                },
-            )
-        )
+        buf = self._log_buffers.get(panel)
+        if buf is None:
+            buf = self._log_buffers[panel] = deque(maxlen=self._max_log_buffer_lines)
+        is_toolkit = panel == "send" and self._is_send_toolkit_raw_source(source)
+        pending = self._log_widget_pending.setdefault(panel, []) if panel in self._log_widgets else None
+        for item in texts:
+            # Worker lines arrive pre-classified as (text, tag); lines logged on the Tk thread are bare strings.
+            if isinstance(item, str):
+                text, tag = item, _classify_log_tag(item)
+            else:
+                text, tag = item
+            if len(buf) == buf.maxlen:
+                # The append below evicts the oldest line.
+                if panel == "send" and self._is_send_toolkit_raw_source(buf[0][2]):
+                    self._log_toolkit_counts[panel] = max(0, self._log_toolkit_counts.get(panel, 0) - 1)
+                print(f"[LOG_BUFFER_TRIM] panel={panel} removed=1 max={self._max_log_buffer_lines}")
+            buf.append((text, tag, source))
+            if is_toolkit:
+                self._log_toolkit_counts[panel] += 1
+                toolkit_count = self._log_toolkit_counts[panel]
+                if toolkit_count > self._max_toolkit_log_buffer_lines:
+                    to_remove = toolkit_count - self._max_toolkit_log_buffer_lines
+                    removed = 0
+                    i = 0
+                    while removed < to_remove and i < len(buf):
+                        if self._is_send_toolkit_raw_source(buf[i][2]):
+                            del buf[i]
+                            removed += 1
+                            self._log_toolkit_counts[panel] = max(0, self._log_toolkit_counts.get(panel, 0) - 1)
+                        else:
+                            i += 1
+                    if removed > 0:
+                        print(
+                            f"[LOG_TOOLKIT_TRIM] panel=send removed={removed} toolkit_lines_kept={self._max_toolkit_log_buffer_lines}"
+                        )
+            if pending is not None:
+                pending.append((text, self._log_widget_tags(tag, source)))
+        if pending and self._log_widget_flush_after_id is None:
+            self._log_widget_flush_after_id = self.after_idle(self._flush_log_widgets)
 
-    def _begin_log_refresh_render(
-        self,
-        panel: str,
-        token: int,
-        filtered_lines: list[tuple[str, str, str]],
-        *,
-        build_duration_ms: int,
-        source: str,
-    ) -> None:
-        widget = self._log_widgets.get(panel)
-        if widget is None:
-            return
-        prev_render = self._log_render_after_ids.get(panel)
-        if prev_render:
+    def _flush_log_widgets(self) -> None:
+        if self._log_widget_flush_after_id is not None:
             try:
-                self.after_cancel(prev_render)
+                self.after_cancel(self._log_widget_flush_after_id)
             except Exception:
                 pass
-            self._log_render_after_ids[panel] = None
-        self._log_render_state[panel] = {
-            "token": token,
-            "lines": filtered_lines,
-            "index": 0,
-            "inserted": 0,
-            "started_at": time.monotonic(),
-            "build_duration_ms": build_duration_ms,
-            "source": source,
-        }
-        widget.delete("1.0", "end")
-        self._log_render_after_ids[panel] = self.after(0, lambda: self._render_log_refresh_batch(panel))
-
-    def _render_log_refresh_batch(self, panel: str) -> None:
-        state = self._log_render_state.get(panel)
-        widget = self._log_widgets.get(panel)
-        if not state or widget is None:
-            return
-        token = state.get("token", 0)
-        if token != self._log_refresh_tokens.get(panel, 0):
-            self._emit_log_refresh_marker(
-                panel,
-                f"[LOG_REFRESH_CANCELLED] panel={panel} stale_token={token}",
-            )
-            self._log_render_state.pop(panel, None)
-            self._log_render_after_ids[panel] = None
-            return
-
-        lines = state.get("lines", [])
-        idx = int(state.get("index", 0))
-        next_idx = min(idx + self._log_refresh_batch_size, len(lines))
-        batch = lines[idx:next_idx]
-        for text, tag, _source in batch:
-            self._append_widget_line(widget, text, tag, enforce_limit=False, auto_scroll=False)
-        state["index"] = next_idx
-        state["inserted"] = int(state.get("inserted", 0)) + len(batch)
-
-        if next_idx < len(lines):
-            remaining = len(lines) - next_idx
-            self._emit_log_refresh_marker(
-                panel,
-                f"[LOG_REFRESH_BATCH] panel={panel} token={token} inserted={state.get('inserted', 0)} "
-                f"remaining={remaining}",
-            )
-            self._log_render_after_ids[panel] = self.after(1, lambda: self._render_log_refresh_batch(panel))
-            return
-
-        # finalize view housekeeping once per refresh
-        line_count = int(widget.index("end-1c").split(".")[0])
-        if line_count > self._max_log_buffer_lines:
-            excess = line_count - self._max_log_buffer_lines
-            widget.delete("1.0", f"{excess + 1}.0")
-        widget.see("end")
-        elapsed_ms = int((time.monotonic() - float(state.get("started_at", time.monotonic()))) * 1000)
-        self._emit_log_refresh_marker(
-            panel,
-            f"[LOG_REFRESH_END] panel={panel} token={token} inserted={state.get('inserted', 0)} "
-            f"build_ms={state.get('build_duration_ms', 0)} render_ms={elapsed_ms} source={state.get('source', 'UNK')}",
-        )
-        self._log_render_state.pop(panel, None)
-        self._log_render_after_ids[panel] = None
-
-    def _refresh_log_view(self, panel: str) -> None:
-        self._schedule_log_refresh(panel, debounce_ms=0)
+            self._log_widget_flush_after_id = None
+        for panel, pending in self._log_widget_pending.items():
+            if not pending:
+                continue
+            self._log_widget_pending[panel] = []
+            self._append_widget_lines(panel, pending)
 
-    def _append_log_line(self, panel: str, text: str, source: str = "internal") -> None:
-        tag = self._classify_log_tag(text)
-        buf = self._log_buffers.setdefault(panel, [])
-        buf.append((text, tag, source))
-        if panel == "send" and self._is_send_toolkit_raw_source(source):
-            self._log_toolkit_counts[panel] = self._log_toolkit_counts.get(panel, 0) + 1
-        if panel == "send" and self._is_send_toolkit_raw_source(source):
-            toolkit_count = self._log_toolkit_counts.get(panel, 0)
-            if toolkit_count > self._max_toolkit_log_buffer_lines:
-                to_remove = toolkit_count - self._max_toolkit_log_buffer_lines
-                removed = 0
-                i = 0
-                while removed < to_remove and i < len(buf):
-                    if self._is_send_toolkit_raw_source(buf[i][2]):
-                        del buf[i]
-                        removed += 1
-                        self._log_toolkit_counts[panel] = max(0, self._log_toolkit_counts.get(panel, 0) - 1)
-                    else:
-                        i += 1
-                if removed > 0:
-                    print(
-                        f"[LOG_TOOLKIT_TRIM] panel=send removed={removed} toolkit_lines_kept={self._max_toolkit_log_buffer_lines}"
-                    )
-        if len(buf) > self._max_log_buffer_lines:
-            removed = len(buf) - self._max_log_buffer_lines
-            if removed > 0 and panel == "send":
-                toolkit_removed = sum(1 for _text, _tag, src in buf[:removed] if self._is_send_toolkit_raw_source(src))
-                if toolkit_removed:
-                    self._log_toolkit_counts[panel] = max(
-                        0,
-                        self._log_toolkit_counts.get(panel, 0) - toolkit_removed,
-                    )
-            del buf[:removed]
-            print(f"[LOG_BUFFER_TRIM] panel={panel} removed={removed} max={self._max_log_buffer_lines}")
-        self._log_buffer_versions[panel] = self._log_buffer_versions.get(panel, 0) + 1
-        if len(self._log_filter_cache) > 32:
-            latest_versions = self._log_buffer_versions.copy()
-            self._log_filter_cache = {
-                key: val
-                for key, val in self._log_filter_cache.items()
-                if latest_versions.get(key[0], -1) == key[4]
-            }
-        if not self._line_matches_filter(panel, tag, source):
-            return
-        widget = self._log_widgets.get(panel)
-        if widget is None:
-            return
-        self._append_widget_line(widget, text, tag)
+    def _enqueue_log(self, event: str, text: str) -> None:
+        # Called from worker threads: classify there so the Tk loop only renders.
+        self.queue.append((event, (text, _classify_log_tag(text))))
 
     def _log_an(self, text: str):
         self._append_log_line("an", text)
@@ -1760,142 +1859,150 @@ class App(tk.Tk):
         return f"{n:.2f} PB"
 
     def _poll_queue(self):
-        try:
-            while True:
-                event, payload = self.queue.get_nowait()
-                if event == "an_log":
-                    self._log_an(payload)
-                elif event == "an_progress":
-                    self.analysis_progress_var.set(payload)
-                elif event == "send_log":
-                    self._log_send(payload, source="internal")
-                elif event == "send_log_internal":
-                    self._log_send(payload, source="internal")
-                elif event == "send_log_toolkit":
-                    self._log_send(payload, source="toolkit_stream")
-                elif event == "val_log":
-                    self._log_val(payload)
-                elif event == "log_refresh_ready":
-                    panel = payload.get("panel", "")
-                    token = int(payload.get("token", 0))
-                    if token != self._log_refresh_tokens.get(panel, 0):
-                        self._emit_log_refresh_marker(
-                            panel,
-                            f"[LOG_REFRESH_CANCELLED] panel={panel} stale_token={token} reason=worker_result",
-                        )
-                        continue
-                    cache_key = payload.get("cache_key")
-                    if isinstance(cache_key, tuple):
-                        self._log_filter_cache[cache_key] = list(payload.get("lines", []))
-                    self._begin_log_refresh_render(
-                        panel,
-                        token,
-                        list(payload.get("lines", [])),
-                        build_duration_ms=int(payload.get("build_duration_ms", 0)),
-                        source="WORKER",
+        drained = 0
+        # Progress updates supersede each other; only the latest of this tick is applied.
+        latest_an_progress = None
+        latest_send_progress = None
+        # Consecutive log events for the same panel/source are appended as one run.
+        log_run_target = None
+        log_run: list[str | tuple[str, str]] = []
+        queue = self.queue
+        while queue and drained < self._poll_queue_max_drain:
+            event, payload = queue.popleft()
+            drained += 1
+            # Log lines are the bulk of the traffic: one table lookup instead of the elif chain.
+            log_target = _LOG_EVENT_TARGETS.get(event)
+            if log_target is not None:
+                if log_target is not log_run_target:
+                    if log_run:
+                        self._append_log_lines(log_run_target[0], log_run, log_run_target[1])
+                        log_run = []
+                    log_run_target = log_target
+                log_run.append(payload)
+                continue
+            if log_run:
+                # Keep ordering with the lines logged by the handlers below.
+                self._append_log_lines(log_run_target[0], log_run, log_run_target[1])
+                log_run = []
+            if event == "an_progress":
+                latest_an_progress = payload
+            elif event == "an_done":
+                latest_an_progress = None
+                an_duration = payload.get("analysis_duration_sec")
+                if an_duration is not None:
+                    self._log_an(
+                        f"Analise finalizada. Run ID: {payload.get('run_id')} | "
+                        f"Duracao: {format_duration_sec(float(an_duration))}"
                     )
-                elif event == "an_done":
-                    an_duration = payload.get("analysis_duration_sec")
-                    if an_duration is not None:
-                        self._log_an(
-                            f"Analise finalizada. Run ID: {payload.get('run_id')} | "
-                            f"Duracao: {format_duration_sec(float(an_duration))}"
+                else:
+                    self._log_an(f"Analise finalizada. Run ID: {payload.get('run_id')}")
+                self.analysis_progress_var.set("progresso analise: finalizada")
+                self.var_send_run.set(payload.get("run_id", ""))
+                self.var_val_run.set(payload.get("run_id", ""))
+                self.var_run_id.set(payload.get("run_id", ""))
+                self._apply_batch_limit_for_run(payload.get("run_id", ""), notify=True, auto_set=True)
+                self._refresh_run_list()
+                self.lbl_dash.set(
+                    "Resumo:\n"
+                    f"- run_id: {payload.get('run_id')}\n"
+                    f"- pastas totais: {payload.get('folders_total')}\n"
+                    f"- pastas selecionadas: {payload.get('folders_selected')}\n"
+                    f"- arquivos totais: {payload.get('files_total')}\n"
+                    f"- arquivos selecionados: {payload.get('files_selected')}\n"
+                    f"- tamanho total: {self._human_size(int(payload.get('size_total_bytes') or 0))}\n"
+                    f"- tamanho selecionado: {self._human_size(int(payload.get('size_selected_bytes') or 0))}\n"
+                    f"- chunks estimados: {payload.get('chunks_total')} ({payload.get('chunk_unit')})\n"
+                    f"- batch max cmd (dcm4che): {payload.get('batch_max_cmd') or 'N/A'}\n"
+                    f"- duracao analise: {format_duration_sec(float(payload.get('analysis_duration_sec') or 0))}"
+                )
+            elif event == "send_progress":
+                latest_send_progress = payload
+            elif event == "send_done":
+                status = payload.get("status")
+                send_duration = payload.get("send_duration_sec")
+                if status == "ALREADY_SENT_PASS":
+                    self._log_send(f"RUN ja enviado com sucesso anteriormente. Run ID: {payload.get('run_id')}")
+                else:
+                    if send_duration is not None:
+                        self._log_send(
+                            f"SEND finalizado. Run ID: {payload.get('run_id')} | Status: {status} | "
+                            f"Duracao: {format_duration_sec(float(send_duration))}"
                         )
                     else:
-                        self._log_an(f"Analise finalizada. Run ID: {payload.get('run_id')}")
-                    self.analysis_progress_var.set("progresso analise: finalizada")
-                    self.var_send_run.set(payload.get("run_id", ""))
-                    self.var_val_run.set(payload.get("run_id", ""))
-                    self.var_run_id.set(payload.get("run_id", ""))
-                    self._apply_batch_limit_for_run(payload.get("run_id", ""), notify=True, auto_set=True)
-                    self._refresh_run_list()
-                    self.lbl_dash.set(
-                        "Resumo:\n"
-                        f"- run_id: {payload.get('run_id')}\n"
-                        f"- pastas totais: {payload.get('folders_total')}\n"
-                        f"- pastas selecionadas: {payload.get('folders_selected')}\n"
-                        f"- arquivos totais: {payload.get('files_total')}\n"
-                        f"- arquivos selecionados: {payload.get('files_selected')}\n"
-                        f"- tamanho total: {self._human_size(int(payload.get('size_total_bytes') or 0))}\n"
-                        f"- tamanho selecionado: {self._human_size(int(payload.get('size_selected_bytes') or 0))}\n"
-                        f"- chunks estimados: {payload.get('chunks_total')} ({payload.get('chunk_unit')})\n"
-                        f"- batch max cmd (dcm4che): {payload.get('batch_max_cmd') or 'N/A'}\n"
-                        f"- duracao analise: {format_duration_sec(float(payload.get('analysis_duration_sec') or 0))}"
+                        self._log_send(f"SEND finalizado. Run ID: {payload.get('run_id')} | Status: {status}")
+                self._refresh_run_list()
+            elif event == "val_done":
+                val_duration = payload.get("validation_duration_sec")
+                try:
+                    val_parallel = max(
+                        1,
+                        int(payload.get("validation_parallel_requests") or self._validation_timer_parallel or 1),
                     )
-                elif event == "send_progress":
-                    done, total, cno, ctot, _tech_no, _tech_total, is_resuming, resume_label = payload
-                    self.progress_items_var.set(f"enviando item {done} de {total}")
-                    if is_resuming:
-                        self.progress_chunks_var.set(f"batch chunk {cno} de {ctot} | retomada: {resume_label}")
-                    else:
-                        self.progress_chunks_var.set(f"batch chunk {cno} de {ctot} | retomada: nao")
-                elif event == "send_done":
-                    status = payload.get("status")
-                    send_duration = payload.get("send_duration_sec")
-                    if status == "ALREADY_SENT_PASS":
-                        self._log_send(f"RUN ja enviado com sucesso anteriormente. Run ID: {payload.get('run_id')}")
-                    else:
-                        if send_duration is not None:
-                            self._log_send(
-                                f"SEND finalizado. Run ID: {payload.get('run_id')} | Status: {status} | "
-                                f"Duracao: {format_duration_sec(float(send_duration))}"
-                            )
-                        else:
-                            self._log_send(f"SEND finalizado. Run ID: {payload.get('run_id')} | Status: {status}")
-                    self._refresh_run_list()
-                elif event == "val_done":
-                    val_duration = payload.get("validation_duration_sec")
-                    try:
-                        val_parallel = max(
-                            1,
-                            int(payload.get("validation_parallel_requests") or self._validation_timer_parallel or 1),
-                        )
-                    except Exception:
-                        val_parallel = max(1, int(self._validation_timer_parallel or 1))
-                    self._validation_timer_parallel = val_parallel
-                    if val_duration is not None:
-                        self._log_val(
-                            f"[VAL_END] Run ID: {payload.get('run_id')} | Status: {payload.get('status')} | "
-                            f"Duracao: {format_duration_sec(float(val_duration))}"
-                        )
-                        self._stop_validation_timer(
-                            status=str(payload.get("status", "OK")),
-                            duration_sec=float(val_duration),
-                        )
-                    else:
-                        self._log_val(f"[VAL_END] Run ID: {payload.get('run_id')} | Status: {payload.get('status')}")
-                        self._stop_validation_timer(status=str(payload.get("status", "OK")))
-                    self._refresh_run_list()
-                elif event == "report_done":
+                except Exception:
+                    val_parallel = max(1, int(self._validation_timer_parallel or 1))
+                self._validation_timer_parallel = val_parallel
+                if val_duration is not None:
                     self._log_val(
-                        "RELATORIO exportado. "
-                        f"Run ID: {payload.get('run_id')} | Modo: {payload.get('mode')} | "
-                        f"Linhas: {payload.get('rows')} | OK: {payload.get('ok')} | ERRO: {payload.get('erro')}\n"
-                        f"Arquivo: {payload.get('report_file')}"
+                        f"[VAL_END] Run ID: {payload.get('run_id')} | Status: {payload.get('status')} | "
+                        f"Duracao: {format_duration_sec(float(val_duration))}"
                     )
-                    self._refresh_run_list()
-                elif event == "an_error":
-                    self._log_an(f"[ERRO] {payload}")
-                    self.analysis_progress_var.set("progresso analise: erro")
-                    messagebox.showerror("Erro na Analise", payload)
-                elif event == "an_cancelled":
-                    self._log_an(payload)
-                    self.analysis_progress_var.set("progresso analise: cancelado")
-                elif event == "send_error":
-                    self._log_send(f"[ERRO] {payload}")
-                    messagebox.showerror("Erro no SEND", payload)
-                elif event == "val_error":
-                    self._log_val(f"[ERRO] {payload}")
-                    payload_text = str(payload or "")
-                    status = "CANCELADA" if "cancel" in payload_text.lower() else "ERRO"
-                    self._stop_validation_timer(status=status)
-                    messagebox.showerror("Erro na VALIDACAO", payload)
-                elif event == "report_error":
-                    self._log_val(f"[ERRO] {payload}")
-                    messagebox.showerror("Erro na exportacao do relatorio", payload)
-        except queue.Empty:
-            pass
+                    self._stop_validation_timer(
+                        status=str(payload.get("status", "OK")),
+                        duration_sec=float(val_duration),
+                    )
+                else:
+                    self._log_val(f"[VAL_END] Run ID: {payload.get('run_id')} | Status: {payload.get('status')}")
+                    self._stop_validation_timer(status=str(payload.get("status", "OK")))
+                self._refresh_run_list()
+            elif event == "report_done":
+                self._log_val(
+                    "RELATORIO exportado. "
+                    f"Run ID: {payload.get('run_id')} | Modo: {payload.get('mode')} | "
+                    f"Linhas: {payload.get('rows')} | OK: {payload.get('ok')} | ERRO: {payload.get('erro')}\n"
+                    f"Arquivo: {payload.get('report_file')}"
+                )
+                self._refresh_run_list()
+            elif event == "an_error":
+                latest_an_progress = None
+                self._log_an(f"[ERRO] {payload}")
+                self.analysis_progress_var.set("progresso analise: erro")
+                messagebox.showerror("Erro na Analise", payload)
+            elif event == "an_cancelled":
+                latest_an_progress = None
+                self._log_an(payload)
+                self.analysis_progress_var.set("progresso analise: cancelado")
+            elif event == "send_error":
+                self._log_send(f"[ERRO] {payload}")
+                messagebox.showerror("Erro no SEND", payload)
+            elif event == "val_error":
+                self._log_val(f"[ERRO] {payload}")
+                payload_text = str(payload or "")
+                status = "CANCELADA" if "cancel" in payload_text.lower() else "ERRO"
+                self._stop_validation_timer(status=status)
+                messagebox.showerror("Erro na VALIDACAO", payload)
+            elif event == "report_error":
+                self._log_val(f"[ERRO] {payload}")
+                messagebox.showerror("Erro na exportacao do relatorio", payload)
+        if log_run:
+            self._append_log_lines(log_run_target[0], log_run, log_run_target[1])
+        if latest_an_progress is not None:
+            self._set_var_if_changed(self.analysis_progress_var, latest_an_progress)
+        if latest_send_progress is not None:
+            done, total, cno, ctot, _tech_no, _tech_total, is_resuming, resume_label = latest_send_progress
+            self._set_var_if_changed(
+                self.progress_send_var,
+                self._format_send_progress(done, total, cno, ctot, is_resuming, resume_label),
+            )
+        self._flush_log_widgets()
         self._tick_validation_timer()
         self._sync_activity_indicator()
         self._reconcile_send_tail_state()
-        self.after(120, self._poll_queue)
+        if drained >= self._poll_queue_max_drain:
+            # Queue still has a backlog: keep draining as soon as Tk is idle.
+            self.after_idle(self._poll_queue)
+        elif drained >= self._poll_queue_busy_threshold:
+            self.after(self._poll_queue_busy_ms, self._poll_queue)
+        elif drained:
+            self.after(self._poll_queue_active_ms, self._poll_queue)
+        else:
+            self.after(self._poll_queue_idle_ms, self._poll_queue)
@@ -1,3 +1,4 @@
+import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 
@@ -35,6 +36,7 @@ class ConfigDialog(tk.Toplevel):
         self.var_validation_parallel_requests = tk.StringVar(
             value=str(int(getattr(config, "validation_parallel_requests", 2)))
         )
+        self.var_scan_workers = tk.StringVar(value=str(int(getattr(config, "scan_workers", AppConfig.scan_workers))))
         self.var_send_precheck_before_send = tk.BooleanVar(value=bool(config.send_precheck_before_send))
 
         frm = ttk.Frame(self, padding=12)
@@ -73,9 +75,10 @@ class ConfigDialog(tk.Toplevel):
         self._row_entry(frm, 8, "Rotacao do storescu log (MB)", self.var_storescu_log_rotate_max_mb)
         self._row_entry(frm, 9, "Rotacao dos arquivos internos (MB)", self.var_internal_text_rotate_max_mb)
         self._row_entry(frm, 10, "Consultas REST paralelas na validacao (1-5)", self.var_validation_parallel_requests)
+        self._row_entry(frm, 11, "Threads de varredura na analise (1-16)", self.var_scan_workers)
 
         self.filter_frame = ttk.LabelFrame(frm, text="Filtro de arquivos para analise", padding=8)
-        self.filter_frame.grid(row=11, column=0, columnspan=2, sticky="we", pady=(6, 0))
+        self.filter_frame.grid(row=12, column=0, columnspan=2, sticky="we", pady=(6, 0))
         self.filter_frame.columnconfigure(1, weight=1)
         self.chk_include_all = ttk.Checkbutton(
             self.filter_frame,
@@ -99,17 +102,18 @@ class ConfigDialog(tk.Toplevel):
             frm,
             text="Calcular size_bytes na analise (mais lento)",
             variable=self.var_collect_size,
-        ).grid(row=12, column=0, columnspan=2, sticky="w")
+        ).grid(row=13, column=0, columnspan=2, sticky="w")
         ttk.Checkbutton(
             frm,
             text="Pre-checagem DICOM antes do send (dcmtk, mais lento)",
             variable=self.var_send_precheck_before_send,
-        ).grid(row=13, column=0, columnspan=2, sticky="w")
+        ).grid(row=14, column=0, columnspan=2, sticky="w")
         self._toggle_dcm4che_controls()
 
         btns = ttk.Frame(frm)
-        btns.grid(row=14, column=0, columnspan=2, pady=(12, 0), sticky="e")
-        ttk.Button(btns, text="Testar Echo", command=self._test_echo).pack(side="left", padx=4)
+        btns.grid(row=15, column=0, columnspan=2, pady=(12, 0), sticky="e")
+        self.btn_test_echo = ttk.Button(btns, text="Testar Echo", command=self._test_echo)
+        self.btn_test_echo.pack(side="left", padx=4)
         ttk.Button(btns, text="Salvar", command=self._save).pack(side="left", padx=4)
         ttk.Button(btns, text="Fechar", command=self.destroy).pack(side="left", padx=4)
 
@@ -172,6 +176,9 @@ class ConfigDialog(tk.Toplevel):
         validation_parallel_requests = int(self.var_validation_parallel_requests.get().strip())
         if validation_parallel_requests < 1 or validation_parallel_requests > 5:
             raise ValueError("Consultas REST paralelas na validacao deve estar entre 1 e 5.")
+        scan_workers = int(self.var_scan_workers.get().strip())
+        if scan_workers < 1 or scan_workers > 16:
+            raise ValueError("Threads de varredura na analise deve estar entre 1 e 16.")
         return AppConfig(
             toolkit=self.var_toolkit.get().strip(),
             aet_origem=self.var_aet_src.get().strip(),
@@ -184,7 +191,9 @@ class ConfigDialog(tk.Toplevel):
             restrict_extensions=not bool(self.var_include_all_files.get()),
             include_no_extension=bool(self.var_no_ext.get()),
             collect_size_bytes=bool(self.var_collect_size.get()),
+            scan_workers=scan_workers,
             ts_mode=self._base_config.ts_mode,
+            metadata_workers=int(getattr(self._base_config, "metadata_workers", AppConfig.metadata_workers)),
             dcm4che_send_mode=normalize_dcm4che_send_mode(self.var_dcm4che_send_mode.get().strip()),
             dcm4che_iuid_update_mode=normalize_dcm4che_iuid_update_mode(self.var_dcm4che_iuid_update_mode.get().strip()),
             storescu_log_rotate_max_mb=storescu_log_rotate_max_mb,
@@ -196,13 +205,34 @@ class ConfigDialog(tk.Toplevel):
     def _test_echo(self):
         try:
             cfg = self._build_config()
-            ok, msg = self.on_test_echo(cfg)
-            if ok:
-                messagebox.showinfo("Echo OK", msg or "Echo executado com sucesso.", parent=self)
-            else:
-                messagebox.showerror("Echo Falhou", msg or "Falha no echo.", parent=self)
         except Exception as ex:
             messagebox.showerror("Erro", str(ex), parent=self)
+            return
+        # The echo can block up to its timeout; run it off the Tk thread, one at a time.
+        self.btn_test_echo.configure(state="disabled")
+        result: list[tuple[bool, str]] = []
+
+        def worker():
+            try:
+                result.append(self.on_test_echo(cfg))
+            except Exception as ex:
+                result.append((False, str(ex)))
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(100, lambda: self._poll_test_echo(result))
+
+    def _poll_test_echo(self, result: list[tuple[bool, str]]):
+        if not self.winfo_exists():
+            return
+        if not result:
+            self.after(100, lambda: self._poll_test_echo(result))
+            return
+        self.btn_test_echo.configure(state="normal")
+        ok, msg = result[0]
+        if ok:
+            messagebox.showinfo("Echo OK", msg or "Echo executado com sucesso.", parent=self)
+        else:
+            messagebox.showerror("Echo Falhou", msg or "Falha no echo.", parent=self)
 
     def _save(self):
         try:
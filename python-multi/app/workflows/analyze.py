@@ -3,17 +3,20 @@ import math
 import os
 import threading
 import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 from app.config.settings import AppConfig
 from app.domain.constants import CSV_SEP
 from app.infra.run_artifacts import (
+    TelemetryEventEmitter,
+    append_csv_rows,
     cleanup_run_artifact_variants,
     next_incremental_rotated_path,
     resolve_run_artifact_path,
     set_internal_text_rotate_max_mb,
     write_csv_row,
-    write_telemetry_event,
 )
 from app.integrations.toolkit_drivers import apply_internal_toolkit_paths, inspect_dicomdir_candidate
 from app.shared.utils import (
@@ -35,6 +38,77 @@ from app.shared.utils import (
 
 DICOMDIR_GUARD_MARKER = "DICOMDIR_GUARD_MARKER_20260228_R1"
 
+# manifest_files.csv stays open for the whole scan; a large buffer keeps writes in big blocks.
+_MANIFEST_WRITE_BUFFER = 1 << 20
+
+# Column order of manifest_files.csv; scan rows are buffered as tuples in this order.
+_MANIFEST_TUPLE_FIELDS = (
+    "run_id",
+    "seq",
+    "file_path",
+    "folder_path",
+    "extension",
+    "size_bytes",
+    "selected_for_send",
+    "selection_reason",
+    "dicom_status",
+    "discovered_at",
+    "timestamp_br",
+    "timestamp_iso",
+)
+
+
+def _list_scan_folder(folder: str) -> tuple[str, list[str], list[os.DirEntry], Exception | None]:
+    """List one directory: (folder, child_dirs, file_entries, error)."""
+    child_dirs: list[str] = []
+    file_entries: list[os.DirEntry] = []
+    error: Exception | None = None
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    child_dirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    file_entries.append(entry)
+    except Exception as ex:
+        error = ex
+    return folder, child_dirs, file_entries, error
+
+
+def _iter_scan_folders(root: str, workers: int = 1):
+    """Walk root; yield (folder, file_entries, pending_dirs, error) per directory.
+
+    Keeps the os.scandir traversal out of the per-file selection loop. Files listed
+    before a scandir failure are still yielded, with the error alongside them.
+    With workers > 1 the listings of the next folders on the stack are prefetched on a
+    thread pool; folders are still yielded in the sequential walk order.
+    """
+    if workers <= 1:
+        # Plain path strings: directories are only popped and scanned, never need a Path object.
+        dir_stack: list[str] = [root]
+        while dir_stack:
+            folder, child_dirs, file_entries, error = _list_scan_folder(dir_stack.pop())
+            dir_stack.extend(child_dirs)
+            yield folder, file_entries, len(dir_stack), error
+        return
+
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="analysis-scan")
+    prefetch = workers * 2
+    dir_stack = [root]
+    listings: dict[str, Future] = {}
+    try:
+        while dir_stack:
+            # Top of the stack is popped next: submit it first so the pool works in pop order.
+            for folder in reversed(dir_stack[-prefetch:]):
+                if folder not in listings:
+                    listings[folder] = pool.submit(_list_scan_folder, folder)
+            folder, child_dirs, file_entries, error = listings.pop(dir_stack.pop()).result()
+            dir_stack.extend(child_dirs)
+            yield folder, file_entries, len(dir_stack), error
+    finally:
+        # On cancel the consumer stops iterating; drop queued listings instead of draining them.
+        pool.shutdown(wait=True, cancel_futures=True)
+
 
 class AnalyzeWorkflow:
     def __init__(self, cfg: AppConfig, logger, cancel_event: threading.Event, progress_callback=None):
@@ -42,6 +116,7 @@ class AnalyzeWorkflow:
         self.logger = logger
         self.cancel_event = cancel_event
         self.progress_callback = progress_callback
+        self._events_emitter: TelemetryEventEmitter | None = None
 
     def _log(self, msg: str) -> None:
         self.logger(msg)
@@ -71,6 +146,19 @@ class AnalyzeWorkflow:
         return f"{base}_{suffix}"
 
     def run_analysis(self, exam_root: str, batch_size: int, run_id: str = "") -> dict:
+        try:
+            return self._run_analysis(exam_root, batch_size, run_id)
+        finally:
+            if self._events_emitter is not None:
+                events_error = self._events_emitter.close()
+                if events_error is not None:
+                    self._log(
+                        f"[WARN] events.csv: {self._events_emitter.dropped_events} evento(s) descartado(s) "
+                        f"| erro={events_error}"
+                    )
+                self._events_emitter = None
+
+    def _run_analysis(self, exam_root: str, batch_size: int, run_id: str) -> dict:
         analysis_start_ts = time.monotonic()
         # Keep original behavior from monolithic app.py where base dir was project root.
         script_dir = Path(__file__).resolve().parent.parent.parent
@@ -105,6 +193,8 @@ class AnalyzeWorkflow:
         manifest_files = resolve_run_artifact_path(run_dir, "manifest_files.csv", for_write=True, logger=self._log)
         summary = resolve_run_artifact_path(run_dir, "analysis_summary.csv", for_write=True, logger=self._log)
         events = resolve_run_artifact_path(run_dir, "events.csv", for_write=True, logger=self._log)
+        self._events_emitter = TelemetryEventEmitter(events)
+        emit_event = self._events_emitter.emit
 
         # Keep toolkit paths synchronized with the runtime bundle before DICOMDIR inspection.
         apply_internal_toolkit_paths(self.cfg, script_dir, self._log)
@@ -114,8 +204,7 @@ class AnalyzeWorkflow:
         dcmdump_exists = "0"
         if dcmtk_bin:
             dcmdump_exists = "1" if (Path(dcmtk_bin) / "dcmdump.exe").exists() else "0"
-        write_telemetry_event(
-            events,
+        emit_event(
             run,
             "ANALYSIS_BUILD_MARKER",
             "Marcador de build/runtime para diagnostico DICOMDIR.",
@@ -126,13 +215,40 @@ class AnalyzeWorkflow:
             ),
         )
 
-        allowed_ext = parse_extensions(self.cfg.allowed_extensions_csv)
+        allowed_ext = frozenset(parse_extensions(self.cfg.allowed_extensions_csv))
         include_no_ext = bool(self.cfg.include_no_extension)
+        collect_size_bytes = bool(self.cfg.collect_size_bytes)
         restrict_extensions = bool(self.cfg.restrict_extensions)
+        try:
+            scan_workers = min(16, max(1, int(getattr(self.cfg, "scan_workers", AppConfig.scan_workers))))
+        except Exception:
+            scan_workers = AppConfig.scan_workers
         dcm4che_send_mode = normalize_dcm4che_send_mode(self.cfg.dcm4che_send_mode)
         force_all_files_for_folders = self.cfg.toolkit == "dcm4che" and dcm4che_send_mode == "FOLDERS"
         if force_all_files_for_folders:
             restrict_extensions = False
+
+        # Selection rule is fixed for the whole scan; pick it once instead of branching per file.
+        if not restrict_extensions:
+
+            def select_by_ext(ext: str) -> tuple[bool, str]:
+                return True, "INCLUDED_ALL_FILES"
+
+        elif include_no_ext:
+
+            def select_by_ext(ext: str) -> tuple[bool, str]:
+                if ext in allowed_ext:
+                    return True, "INCLUDED_EXT"
+                if not ext:
+                    return True, "INCLUDED_NO_EXT"
+                return False, "EXCLUDED_EXTENSION"
+
+        else:
+
+            def select_by_ext(ext: str) -> tuple[bool, str]:
+                if ext in allowed_ext:
+                    return True, "INCLUDED_EXT"
+                return False, "EXCLUDED_EXTENSION"
         self._log(f"[AN_START] run_id={run} toolkit={self.cfg.toolkit} dcm4che_mode={dcm4che_send_mode}")
         self._log("Iniciando descoberta de arquivos...")
         if force_all_files_for_folders:
@@ -146,12 +262,13 @@ class AnalyzeWorkflow:
         else:
             self._log("[AN_FILTER_MODE] mode=all_files include_no_extension=IGNORED")
         self._log(
-            f"[AN_SCAN_CONFIG] collect_size_bytes={'ON' if self.cfg.collect_size_bytes else 'OFF'} "
-            "(OFF melhora performance em arvores muito grandes)"
+            f"[AN_SCAN_CONFIG] collect_size_bytes={'ON' if collect_size_bytes else 'OFF'} scan_workers={scan_workers} "
+            "(OFF melhora performance em arvores muito grandes; totais de tamanho ficam 0)"
         )
         self._progress("progresso analise: preparando varredura...")
 
-        folder_agg: dict[str, dict] = {}
+        # folder_path -> [file_count, size_bytes]
+        folder_agg: defaultdict[str, list[int]] = defaultdict(lambda: [0, 0])
         total_files = 0
         total_bytes = 0
         selected_files = 0
@@ -160,29 +277,19 @@ class AnalyzeWorkflow:
         selected_folder_keys: set[str] = set()
         selected_file_arg_len_max = 0
 
-        file_fields = [
-            "run_id",
-            "seq",
-            "file_path",
-            "folder_path",
-            "extension",
-            "size_bytes",
-            "selected_for_send",
-            "selection_reason",
-            "dicom_status",
-            "discovered_at",
-        ]
         seq = 0
         manifest_files.parent.mkdir(parents=True, exist_ok=True)
-        file_output_fields = [*file_fields, "timestamp_br", "timestamp_iso"]
         progress_interval_sec = 2.0
         buffer_size = 2000
-        row_buffer: list[dict] = []
+        row_buffer: list[tuple] = []
+        # Loop invariants bound to locals; the per-file loop below runs once per scanned file.
+        append_row = row_buffer.append
+        cancel_requested = self.cancel_event.is_set
+        track_file_arg_len = self.cfg.toolkit == "dcm4che" and dcm4che_send_mode != "FOLDERS"
         start_ts = time.monotonic()
         last_progress_ts = start_ts
         dirs_processed = 0
-        dirs_discovered = 1
-        dir_stack: list[Path] = [root]
+        files_at_clock_check = 0
         scan_errors = 0
         dicomdir_candidates = 0
         dicomdir_excluded = 0
@@ -217,16 +324,19 @@ class AnalyzeWorkflow:
             parse_invalid = any(marker in output_blob for marker in parse_invalid_markers)
             return rc_invalid or parse_invalid
 
-        with manifest_files.open("w", newline="", encoding="utf-8") as f_manifest:
-            manifest_writer = csv.DictWriter(f_manifest, fieldnames=file_output_fields, delimiter=CSV_SEP)
-            manifest_writer.writeheader()
+        with manifest_files.open("w", newline="", encoding="utf-8", buffering=_MANIFEST_WRITE_BUFFER) as f_manifest:
+            manifest_writer = csv.writer(f_manifest, delimiter=CSV_SEP)
+            manifest_writer.writerow(_MANIFEST_TUPLE_FIELDS)
 
-            def flush_manifest_buffer() -> None:
+            def flush_manifest_buffer(sync: bool = False) -> None:
+                # Buffer-full flushes only hand rows to the file object; the OS flush and the
+                # size/rotation check run on progress ticks (sync=True) and at the end of the scan.
                 nonlocal f_manifest, manifest_writer
-                if not row_buffer:
+                if row_buffer:
+                    manifest_writer.writerows(row_buffer)
+                    row_buffer.clear()
+                if not sync:
                     return
-                manifest_writer.writerows(row_buffer)
-                row_buffer.clear()
                 f_manifest.flush()
                 try:
                     current_size = manifest_files.stat().st_size if manifest_files.exists() else 0
@@ -245,16 +355,17 @@ class AnalyzeWorkflow:
                         )
                     except Exception as ex:
                         self._log(f"[ARTIFACT_ROTATE_WARN] file={manifest_files} error={ex}")
-                    f_manifest = manifest_files.open("w" if rotate_ok else "a", newline="", encoding="utf-8")
-                    manifest_writer = csv.DictWriter(f_manifest, fieldnames=file_output_fields, delimiter=CSV_SEP)
+                    f_manifest = manifest_files.open(
+                        "w" if rotate_ok else "a", newline="", encoding="utf-8", buffering=_MANIFEST_WRITE_BUFFER
+                    )
+                    manifest_writer = csv.writer(f_manifest, delimiter=CSV_SEP)
                     if rotate_ok:
-                        manifest_writer.writeheader()
+                        manifest_writer.writerow(_MANIFEST_TUPLE_FIELDS)
 
-            while dir_stack:
-                if self.cancel_event.is_set():
-                    flush_manifest_buffer()
-                    write_telemetry_event(
-                        events,
+            for folder, file_entries, pending_dirs, list_error in _iter_scan_folders(str(root), scan_workers):
+                if cancel_requested():
+                    flush_manifest_buffer(sync=True)
+                    emit_event(
                         run,
                         "ANALYSIS_CANCELLED",
                         "Analise cancelada pelo usuario.",
@@ -262,176 +373,176 @@ class AnalyzeWorkflow:
                     )
                     raise WorkflowCancelled("Analise cancelada pelo usuario.")
 
-                folder = dir_stack.pop()
                 dirs_processed += 1
-                folder_key = str(folder)
+                folder_key = folder
+                # One discovery timestamp per directory; all its files are listed together.
+                ts_br, ts_iso = now_dual_timestamp()
                 try:
-                    with os.scandir(folder) as it:
-                        for entry in it:
-                            if entry.is_dir(follow_symlinks=False):
-                                dir_stack.append(Path(entry.path))
-                                dirs_discovered += 1
-                                continue
-                            if not entry.is_file(follow_symlinks=False):
-                                continue
-
-                            seq += 1
+                    for entry in file_entries:
+                        seq += 1
+                        entry_name = entry.name
+                        # Size collection OFF skips the per-file stat syscall entirely; size totals stay 0.
+                        size_actual = 0
+                        if collect_size_bytes:
                             try:
                                 size_actual = entry.stat(follow_symlinks=False).st_size
                             except Exception:
                                 size_actual = 0
-                            # Always keep aggregate totals meaningful, even when per-file size collection is disabled.
-                            size = size_actual if self.cfg.collect_size_bytes else 0
-
-                            ext = Path(entry.name).suffix.lower()
-                            no_ext = ext == ""
-                            if restrict_extensions:
-                                include = (ext in allowed_ext) or (no_ext and include_no_ext)
-                                reason = (
-                                    "INCLUDED_EXT"
-                                    if ext in allowed_ext
-                                    else ("INCLUDED_NO_EXT" if (no_ext and include_no_ext) else "EXCLUDED_EXTENSION")
+                        size = size_actual
+
+                        # Same rule as Path.suffix without building a Path per file.
+                        dot = entry_name.rfind(".")
+                        ext = entry_name[dot:].lower() if 0 < dot < len(entry_name) - 1 else ""
+                        include, reason = select_by_ext(ext)
+
+                        # Guardrail: only exclude DICOMDIR when we can confirm it is
+                        # a Media Storage Directory object (directory index).
+                        if include and entry_name.upper() == "DICOMDIR":
+                            dicomdir_candidates += 1
+                            dicomdir_info = inspect_dicomdir_candidate(self.cfg, Path(entry.path))
+                            if dicomdir_info.get("checked") and dicomdir_info.get("is_directory_index"):
+                                include = False
+                                reason = "EXCLUDED_DICOMDIR_INDEX"
+                                dicomdir_excluded += 1
+                                self._log(
+                                    "[DICOMDIR_EXCLUDED] "
+                                    f"path={entry.path} media_uid={dicomdir_info.get('media_storage_sop_class_uid', '') or 'N/A'} "
+                                    f"sop_uid={dicomdir_info.get('sop_class_uid', '') or 'N/A'} "
+                                    f"has_dir_seq={1 if dicomdir_info.get('has_directory_record_sequence') else 0}"
+                                )
+                                dicomdir_decision = "EXCLUDED_DICOMDIR_INDEX"
+                            elif dicomdir_info.get("checked") and _is_invalid_dicomdir_candidate(dicomdir_info):
+                                include = False
+                                reason = "EXCLUDED_DICOMDIR_INVALID"
+                                dicomdir_invalid += 1
+                                self._log(
+                                    "[DICOMDIR_EXCLUDED_INVALID] "
+                                    f"path={entry.path} dcmdump_rc={dicomdir_info.get('dcmdump_returncode', 'N/A') or 'N/A'} "
+                                    f"stderr={_safe_event_value(dicomdir_info.get('dcmdump_stderr_excerpt', '') or 'N/A')}"
                                 )
+                                dicomdir_decision = "EXCLUDED_DICOMDIR_INVALID"
+                            elif dicomdir_info.get("checked"):
+                                dicomdir_not_index += 1
+                                self._log(
+                                    "[DICOMDIR_NAME_BUT_NOT_INDEX] "
+                                    f"path={entry.path} media_uid={dicomdir_info.get('media_storage_sop_class_uid', '') or 'N/A'} "
+                                    f"sop_uid={dicomdir_info.get('sop_class_uid', '') or 'N/A'} "
+                                    f"has_dir_seq={1 if dicomdir_info.get('has_directory_record_sequence') else 0}"
+                                )
+                                dicomdir_decision = "INCLUDED_DICOMDIR_NOT_INDEX"
                             else:
-                                include = True
-                                reason = "INCLUDED_ALL_FILES"
-
-                            # Guardrail: only exclude DICOMDIR when we can confirm it is
-                            # a Media Storage Directory object (directory index).
-                            if include and entry.name.upper() == "DICOMDIR":
-                                dicomdir_candidates += 1
-                                dicomdir_info = inspect_dicomdir_candidate(self.cfg, Path(entry.path))
-                                if dicomdir_info.get("checked") and dicomdir_info.get("is_directory_index"):
-                                    include = False
-                                    reason = "EXCLUDED_DICOMDIR_INDEX"
-                                    dicomdir_excluded += 1
-                                    self._log(
-                                        "[DICOMDIR_EXCLUDED] "
-                                        f"path={entry.path} media_uid={dicomdir_info.get('media_storage_sop_class_uid', '') or 'N/A'} "
-                                        f"sop_uid={dicomdir_info.get('sop_class_uid', '') or 'N/A'} "
-                                        f"has_dir_seq={1 if dicomdir_info.get('has_directory_record_sequence') else 0}"
-                                    )
-                                    dicomdir_decision = "EXCLUDED_DICOMDIR_INDEX"
-                                elif dicomdir_info.get("checked") and _is_invalid_dicomdir_candidate(dicomdir_info):
-                                    include = False
-                                    reason = "EXCLUDED_DICOMDIR_INVALID"
-                                    dicomdir_invalid += 1
-                                    self._log(
-                                        "[DICOMDIR_EXCLUDED_INVALID] "
-                                        f"path={entry.path} dcmdump_rc={dicomdir_info.get('dcmdump_returncode', 'N/A') or 'N/A'} "
-                                        f"stderr={_safe_event_value(dicomdir_info.get('dcmdump_stderr_excerpt', '') or 'N/A')}"
-                                    )
-                                    dicomdir_decision = "EXCLUDED_DICOMDIR_INVALID"
-                                elif dicomdir_info.get("checked"):
-                                    dicomdir_not_index += 1
-                                    self._log(
-                                        "[DICOMDIR_NAME_BUT_NOT_INDEX] "
-                                        f"path={entry.path} media_uid={dicomdir_info.get('media_storage_sop_class_uid', '') or 'N/A'} "
-                                        f"sop_uid={dicomdir_info.get('sop_class_uid', '') or 'N/A'} "
-                                        f"has_dir_seq={1 if dicomdir_info.get('has_directory_record_sequence') else 0}"
-                                    )
-                                    dicomdir_decision = "INCLUDED_DICOMDIR_NOT_INDEX"
-                                else:
-                                    dicomdir_check_failed += 1
-                                    self._log(
-                                        "[DICOMDIR_CHECK_FAILED] "
-                                        f"path={entry.path} error={dicomdir_info.get('error', 'UNKNOWN')}"
-                                    )
-                                    dicomdir_decision = "INCLUDED_DICOMDIR_CHECK_FAILED"
-                                write_telemetry_event(
-                                    events,
-                                    run,
-                                    "ANALYSIS_DICOMDIR_DECISION",
-                                    "DICOMDIR avaliado.",
-                                    (
-                                        f"marker={DICOMDIR_GUARD_MARKER};path={entry.path};decision={dicomdir_decision};"
-                                        f"checked={1 if dicomdir_info.get('checked') else 0};"
-                                        f"is_directory_index={1 if dicomdir_info.get('is_directory_index') else 0};"
-                                        f"media_uid={dicomdir_info.get('media_storage_sop_class_uid', '') or 'N/A'};"
-                                        f"sop_uid={dicomdir_info.get('sop_class_uid', '') or 'N/A'};"
-                                        f"has_dir_seq={1 if dicomdir_info.get('has_directory_record_sequence') else 0};"
-                                        f"error={_safe_event_value(dicomdir_info.get('error', '') or 'N/A')};"
-                                        f"dcmdump_rc={_safe_event_value(dicomdir_info.get('dcmdump_returncode', '') or 'N/A', 16)};"
-                                        f"dcmdump_cmd={_safe_event_value(dicomdir_info.get('dcmdump_command', '') or 'N/A', 220)};"
-                                        f"dcmdump_stdout={_safe_event_value(dicomdir_info.get('dcmdump_stdout_excerpt', '') or 'N/A')};"
-                                        f"dcmdump_stderr={_safe_event_value(dicomdir_info.get('dcmdump_stderr_excerpt', '') or 'N/A')}"
-                                    ),
+                                dicomdir_check_failed += 1
+                                self._log(
+                                    "[DICOMDIR_CHECK_FAILED] "
+                                    f"path={entry.path} error={dicomdir_info.get('error', 'UNKNOWN')}"
                                 )
-                            if include:
-                                selected_files += 1
+                                dicomdir_decision = "INCLUDED_DICOMDIR_CHECK_FAILED"
+                            emit_event(
+                                run,
+                                "ANALYSIS_DICOMDIR_DECISION",
+                                "DICOMDIR avaliado.",
+                                (
+                                    f"marker={DICOMDIR_GUARD_MARKER};path={entry.path};decision={dicomdir_decision};"
+                                    f"checked={1 if dicomdir_info.get('checked') else 0};"
+                                    f"is_directory_index={1 if dicomdir_info.get('is_directory_index') else 0};"
+                                    f"media_uid={dicomdir_info.get('media_storage_sop_class_uid', '') or 'N/A'};"
+                                    f"sop_uid={dicomdir_info.get('sop_class_uid', '') or 'N/A'};"
+                                    f"has_dir_seq={1 if dicomdir_info.get('has_directory_record_sequence') else 0};"
+                                    f"error={_safe_event_value(dicomdir_info.get('error', '') or 'N/A')};"
+                                    f"dcmdump_rc={_safe_event_value(dicomdir_info.get('dcmdump_returncode', '') or 'N/A', 16)};"
+                                    f"dcmdump_cmd={_safe_event_value(dicomdir_info.get('dcmdump_command', '') or 'N/A', 220)};"
+                                    f"dcmdump_stdout={_safe_event_value(dicomdir_info.get('dcmdump_stdout_excerpt', '') or 'N/A')};"
+                                    f"dcmdump_stderr={_safe_event_value(dicomdir_info.get('dcmdump_stderr_excerpt', '') or 'N/A')}"
+                                ),
+                            )
+                        if include:
+                            selected_files += 1
+                            if size_actual:
                                 selected_bytes += size_actual
-                                selected_folder_keys.add(folder_key)
-                                if self.cfg.toolkit == "dcm4che" and dcm4che_send_mode != "FOLDERS":
-                                    selected_file_arg_len_max = max(selected_file_arg_len_max, _windows_cmdline_arg_len(entry.path))
-                            else:
-                                excluded_files += 1
-
-                            total_files += 1
+                            selected_folder_keys.add(folder_key)
+                            if track_file_arg_len:
+                                selected_file_arg_len_max = max(selected_file_arg_len_max, _windows_cmdline_arg_len(entry.path))
+                        else:
+                            excluded_files += 1
+
+                        total_files += 1
+                        agg = folder_agg[folder_key]
+                        agg[0] += 1
+                        if size_actual:
                             total_bytes += size_actual
-                            agg = folder_agg.setdefault(folder_key, {"count": 0, "bytes": 0})
-                            agg["count"] += 1
-                            agg["bytes"] += size_actual
-
-                            ts_br, ts_iso = now_dual_timestamp()
-                            row_buffer.append(
-                                {
-                                    "run_id": run,
-                                    "seq": seq,
-                                    "file_path": entry.path,
-                                    "folder_path": folder_key,
-                                    "extension": ext,
-                                    "size_bytes": size,
-                                    "selected_for_send": 1 if include else 0,
-                                    "selection_reason": reason,
-                                    "dicom_status": "UNKNOWN",
-                                    "discovered_at": ts_br,
-                                    "timestamp_br": ts_br,
-                                    "timestamp_iso": ts_iso,
-                                }
+                            agg[1] += size_actual
+
+                        # Positional row, same order as _MANIFEST_TUPLE_FIELDS.
+                        append_row(
+                            (
+                                run,
+                                seq,
+                                entry.path,
+                                folder_key,
+                                ext,
+                                size,
+                                1 if include else 0,
+                                reason,
+                                "UNKNOWN",
+                                ts_br,
+                                ts_br,
+                                ts_iso,
                             )
-                            if len(row_buffer) >= buffer_size:
-                                flush_manifest_buffer()
+                        )
+                        if len(row_buffer) >= buffer_size:
+                            flush_manifest_buffer()
+                    if list_error is not None:
+                        raise list_error
                 except Exception as ex:
                     scan_errors += 1
                     if scan_errors <= 5:
                         self._log(f"[WARN] Falha ao escanear pasta: {folder} | erro={ex}")
 
+                # Read the clock every 32 directories, or sooner after large folders.
+                if (dirs_processed & 0x1F) and (total_files - files_at_clock_check) < buffer_size:
+                    continue
+                files_at_clock_check = total_files
                 now_ts = time.monotonic()
                 if (now_ts - last_progress_ts) >= progress_interval_sec:
-                    flush_manifest_buffer()
+                    flush_manifest_buffer(sync=True)
                     elapsed = max(now_ts - start_ts, 0.001)
                     rate_files = total_files / elapsed
                     avg_files_per_dir = total_files / max(dirs_processed, 1)
-                    est_total_files = total_files + int(len(dir_stack) * avg_files_per_dir)
+                    est_total_files = total_files + int(pending_dirs * avg_files_per_dir)
                     remaining_files = max(est_total_files - total_files, 0)
                     eta_seconds = (remaining_files / rate_files) if rate_files > 0 else None
                     self._log(
-                        f"[AN_SCAN_PROGRESS] dirs={dirs_processed} pending_dirs={len(dir_stack)} "
+                        f"[AN_SCAN_PROGRESS] dirs={dirs_processed} pending_dirs={pending_dirs} "
                         f"files={total_files} selected={selected_files} rate={rate_files:.1f} arq/s "
                         f"eta~{format_eta(eta_seconds)}"
                     )
                     self._progress(
-                        f"progresso analise: dirs={dirs_processed} pendentes={len(dir_stack)} "
+                        f"progresso analise: dirs={dirs_processed} pendentes={pending_dirs} "
                         f"arquivos={total_files} selecionados={selected_files} "
                         f"taxa={rate_files:.1f} arq/s eta~{format_eta(eta_seconds)}"
                     )
                     last_progress_ts = now_ts
 
-            flush_manifest_buffer()
+            flush_manifest_buffer(sync=True)
 
         folder_fields = ["run_id", "folder_path", "file_count", "size_bytes", "discovered_at"]
-        for folder, agg in sorted(folder_agg.items()):
-            write_csv_row(
-                manifest_folders,
+        # Folder discovery time is effectively "end of scan": one timestamp and one batch write.
+        # append_csv_rows skips empty batches, so no folders still means no manifest_folders file.
+        discovered_at = now_br()
+        append_csv_rows(
+            manifest_folders,
+            [
                 {
                     "run_id": run,
                     "folder_path": folder,
-                    "file_count": agg["count"],
-                    "size_bytes": agg["bytes"],
-                    "discovered_at": now_br(),
-                },
-                folder_fields,
-            )
+                    "file_count": folder_count,
+                    "size_bytes": folder_bytes,
+                    "discovered_at": discovered_at,
+                }
+                for folder, (folder_count, folder_bytes) in sorted(folder_agg.items())
+            ],
+            folder_fields,
+        )
 
         dcm4che_send_mode = normalize_dcm4che_send_mode(self.cfg.dcm4che_send_mode)
         use_folder_unit = self.cfg.toolkit == "dcm4che" and dcm4che_send_mode == "FOLDERS"
@@ -505,8 +616,7 @@ class AnalyzeWorkflow:
             },
             summary_fields,
         )
-        write_telemetry_event(
-            events,
+        emit_event(
             run,
             "ANALYSIS_END",
             "Analise concluida.",
@@ -518,8 +628,7 @@ class AnalyzeWorkflow:
                 f"analysis_duration_sec={analysis_duration_sec}"
             ),
         )
-        write_telemetry_event(
-            events,
+        emit_event(
             run,
             "ANALYSIS_DICOMDIR_SUMMARY",
             "Resumo DICOMDIR na analise.",
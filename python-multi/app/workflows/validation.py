@@ -1,33 +1,77 @@
+import http.client
 import json
 import threading
 import time
+from collections import defaultdict
+from contextlib import nullcontext
+from itertools import groupby
+from operator import itemgetter
 from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from urllib import error as urlerror
-from urllib import request as urlrequest
 
 from app.config.settings import AppConfig
+from app.domain.constants import SEND_WARNING_STATUSES
 from app.infra.run_artifacts import (
+    EMPTY_IUID_MAP_ENTRY,
+    CsvAppender,
+    IuidMapEntry,
+    TelemetryEventEmitter,
     apply_send_result_updates,
     build_iuid_map_from_send_rows,
     cleanup_run_artifact_variants,
+    list_incremental_rotated_paths,
     merge_iuid_map_from_legacy_file,
     read_csv_rows,
     resolve_run_artifact_path,
     set_internal_text_rotate_max_mb,
     write_csv_row,
     write_csv_table,
-    write_telemetry_event,
 )
 from app.integrations.toolkit_drivers import apply_internal_toolkit_paths, get_driver
 from app.shared.utils import format_duration_sec, now_br
 
+_JSON_DECODER = json.JSONDecoder()
+# http_status values of a query that never got an HTTP answer (transport/parse error).
+_API_ERROR_HTTP_STATUSES = frozenset({"ERR", ""})
+
+
+def _first_json_array_item(body: str):
+    """
+    First element of a JSON array body; the remaining elements are not parsed.
+
+    Non-array bodies are fully parsed (so malformed JSON still raises) and yield None.
+    """
+    text = body.lstrip()
+    if not text:
+        return None
+    if not text.startswith("["):
+        json.loads(text)
+        return None
+    inner = text[1:].lstrip()
+    if not inner or inner.startswith("]"):
+        return None
+    item, _end = _JSON_DECODER.raw_decode(inner)
+    return item
+
 
 class ValidationWorkflow:
+    # Parsed send_results_by_file (+ legacy IUID map) keyed by file stat signature; see _load_send_rows.
+    # One entry (the last run), and only for runs up to _send_rows_cache_max_rows rows.
+    _send_rows_cache: dict[tuple, tuple[list[dict], dict[str, IuidMapEntry]]] = {}
+    _send_rows_cache_max_rows = 200_000
+    _send_rows_cache_lock = threading.Lock()
+
     def __init__(self, cfg: AppConfig, logger, cancel_event: threading.Event):
         self.cfg = cfg
         self.logger = logger
         self.cancel_event = cancel_event
+        self._events_emitter: TelemetryEventEmitter | None = None
+        # One keep-alive HTTP connection per query thread (see _api_get).
+        self._http_local = threading.local()
+        self._http_conns: list[http.client.HTTPConnection] = []
+        self._http_conns_lock = threading.Lock()
+        # Only the IUID varies between instance queries.
+        self._instance_query_prefix = f"/dcm4chee-arc/aets/{cfg.aet_destino}/rs/instances?SOPInstanceUID="
         apply_internal_toolkit_paths(self.cfg, Path(__file__).resolve().parent.parent.parent, self._log)
         self.driver = get_driver(cfg.toolkit)
 
@@ -41,16 +85,14 @@ class ValidationWorkflow:
             raw_value = 2
         return min(5, max(1, raw_value))
 
-    def _query_instance_dataset_safe(self, iuid: str) -> dict:
-        try:
-            return self._query_instance_dataset(iuid)
-        except Exception as ex:
-            return {
-                "api_found": 0,
-                "http_status": "ERR",
-                "detail": str(ex),
-                "dataset": {},
-            }
+    @staticmethod
+    def _lookup_fields(query: dict) -> tuple[int, str, str]:
+        """(api_found, http_status, detail) of a _query_instance_dataset result."""
+        return (
+            1 if query.get("api_found", 0) == 1 else 0,
+            str(query.get("http_status", "")),
+            str(query.get("detail", "")),
+        )
 
     def _iter_iuid_queries(
         self,
@@ -63,18 +105,24 @@ class ValidationWorkflow:
         workers = self._validation_parallel_requests()
         self._log(
             f"[VAL_PAR_CFG] scope={scope} parallel_requests={workers} "
-            f"iuid_total={total} retry=OFF timeout_sec=20"
+            f"iuid_total={total} retry=OFF timeout_sec=20 keepalive=ON"
         )
         if total == 0:
             return
+        try:
+            yield from self._iter_iuid_queries_inner(iuids, workers, cancel_message)
+        finally:
+            self._close_api_connections()
 
+    def _iter_iuid_queries_inner(self, iuids: list[str], workers: int, cancel_message: str):
+        total = len(iuids)
         if workers == 1:
             completed = 0
             for iuid in iuids:
                 if self.cancel_event.is_set():
                     raise RuntimeError(cancel_message)
                 completed += 1
-                yield iuid, self._query_instance_dataset_safe(iuid), completed, total
+                yield iuid, self._query_instance_dataset(iuid), completed, total
             return
 
         with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="val_api") as executor:
@@ -84,7 +132,7 @@ class ValidationWorkflow:
             while next_idx < total and len(pending) < workers and not self.cancel_event.is_set():
                 iuid = iuids[next_idx]
                 next_idx += 1
-                pending[executor.submit(self._query_instance_dataset_safe, iuid)] = iuid
+                pending[executor.submit(self._query_instance_dataset, iuid)] = iuid
 
             completed = 0
             while pending:
@@ -106,7 +154,7 @@ class ValidationWorkflow:
                     while next_idx < total and len(pending) < workers and not self.cancel_event.is_set():
                         next_iuid = iuids[next_idx]
                         next_idx += 1
-                        pending[executor.submit(self._query_instance_dataset_safe, next_iuid)] = next_iuid
+                        pending[executor.submit(self._query_instance_dataset, next_iuid)] = next_iuid
 
             if self.cancel_event.is_set():
                 raise RuntimeError(cancel_message)
@@ -122,6 +170,73 @@ class ValidationWorkflow:
             f"max_bytes={internal_text_rotate_max_bytes}"
         )
 
+    @staticmethod
+    def _send_rows_signature(send_results: Path, legacy_file_iuid_map: Path) -> tuple:
+        paths = [*list_incremental_rotated_paths(send_results), send_results]
+        if legacy_file_iuid_map.exists():
+            paths.append(legacy_file_iuid_map)
+        signature = []
+        for path in paths:
+            st = path.stat()
+            signature.append((str(path), st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+
+    def _load_send_rows(self, send_results: Path, legacy_file_iuid_map: Path) -> tuple[list[dict], dict[str, IuidMapEntry]]:
+        """
+        send_rows and the file -> IUID map, shared between phases while the CSVs are unchanged.
+
+        Rows held by the cache never leave it: callers get fresh copies of the row dicts and of
+        map_by_file (its IuidMapEntry values are immutable), so edits do not leak into later runs.
+        """
+        try:
+            key = self._send_rows_signature(send_results, legacy_file_iuid_map)
+        except Exception:
+            key = None
+        with ValidationWorkflow._send_rows_cache_lock:
+            cached = ValidationWorkflow._send_rows_cache.get(key) if key is not None else None
+        if cached is not None:
+            self._log(f"[SEND_ROWS_CACHE] hit rows={len(cached[0])}")
+            return [dict(row) for row in cached[0]], dict(cached[1])
+        send_rows = read_csv_rows(send_results)
+        map_by_file = build_iuid_map_from_send_rows(send_rows)
+        merge_iuid_map_from_legacy_file(map_by_file, legacy_file_iuid_map)
+        with ValidationWorkflow._send_rows_cache_lock:
+            if key is not None and len(send_rows) <= ValidationWorkflow._send_rows_cache_max_rows:
+                # Only the most recent run is kept.
+                ValidationWorkflow._send_rows_cache = {key: (send_rows, dict(map_by_file))}
+                send_rows = [dict(row) for row in send_rows]
+            else:
+                # Too large to keep resident in the UI process; drop any older entry too.
+                ValidationWorkflow._send_rows_cache = {}
+        return send_rows, map_by_file
+
+    @staticmethod
+    def _invalidate_send_rows_cache() -> None:
+        with ValidationWorkflow._send_rows_cache_lock:
+            ValidationWorkflow._send_rows_cache = {}
+
+    def _extract_metadata_many(self, file_paths: list[str]) -> dict[str, tuple[str, str, str, str]]:
+        """
+        driver.extract_metadata for many files, keyed by the given path string.
+
+        Goes through extract_metadata_batch (grouped dcmdump / metadata_workers threads); files
+        that raised in the batch re-raise here, so their errors surface as before.
+        """
+        unique_paths = list(dict.fromkeys(file_paths))
+        if not unique_paths:
+            return {}
+        self._log(f"[VAL_METADATA_BATCH] files={len(unique_paths)}")
+        by_path = self.driver.extract_metadata_batch(self.cfg, [Path(fp) for fp in unique_paths])
+        out: dict[str, tuple[str, str, str, str]] = {}
+        for fp in unique_paths:
+            meta = by_path.get(str(Path(fp)))
+            if meta is None:
+                meta = self.driver.extract_metadata(self.cfg, Path(fp))
+            elif isinstance(meta, Exception):
+                raise meta
+            out[fp] = meta
+        return out
+
     def _resolve_runs_base(self, script_dir: Path) -> Path:
         if self.cfg.runs_base_dir.strip():
             p = Path(self.cfg.runs_base_dir.strip())
@@ -130,24 +245,62 @@ class ValidationWorkflow:
             return (script_dir / p).resolve()
         return (script_dir / "runs").resolve()
 
+    def _close_api_connections(self) -> None:
+        with self._http_conns_lock:
+            conns, self._http_conns = self._http_conns, []
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._http_local = threading.local()
+
+    def _api_get(self, path: str) -> tuple[int, str, bytes]:
+        """GET on the PACS REST host reusing this thread's keep-alive connection."""
+        local = self._http_local
+        conn = getattr(local, "conn", None)
+        reused = conn is not None
+        if conn is None:
+            conn = http.client.HTTPConnection(self.cfg.pacs_rest_host, timeout=20)
+            local.conn = conn
+            with self._http_conns_lock:
+                self._http_conns.append(conn)
+        try:
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            body = resp.read()
+            if resp.will_close:
+                conn.close()
+            return resp.status, resp.reason, body
+        except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+            conn.close()
+            if not reused:
+                raise
+            # Server dropped an idle keep-alive connection: retry once on a fresh socket.
+            local.conn = None
+            return self._api_get(path)
+        except Exception:
+            conn.close()
+            raise
+
     def _query_instance_dataset(self, iuid: str) -> dict:
-        url = f"http://{self.cfg.pacs_rest_host}/dcm4chee-arc/aets/{self.cfg.aet_destino}/rs/instances?SOPInstanceUID={iuid}"
+        # Never raises: transport and parse errors come back as http_status=ERR.
         api_found = 0
         http_status = ""
         detail = ""
         dataset: dict = {}
         try:
-            req = urlrequest.Request(url, method="GET")
-            with urlrequest.urlopen(req, timeout=20) as resp:
-                http_status = str(resp.status)
-                body = resp.read().decode("utf-8", errors="replace")
-                data = json.loads(body) if body.strip() else []
-                if isinstance(data, list) and len(data) > 0 and isinstance(data[0], dict):
+            status, reason, raw = self._api_get(self._instance_query_prefix + iuid)
+            http_status = str(status)
+            if status >= 300:
+                detail = f"HTTP Error {status}: {reason}"
+            elif raw:
+                # Empty answers (204 / Content-Length: 0, the usual NOT_FOUND) never get here.
+                # Only the first instance is used; a multi-instance answer is not parsed past it.
+                first = _first_json_array_item(raw.decode("utf-8", errors="replace"))
+                if isinstance(first, dict):
                     api_found = 1
-                    dataset = data[0]
-        except urlerror.HTTPError as ex:
-            http_status = str(ex.code)
-            detail = str(ex)
+                    dataset = first
         except Exception as ex:
             http_status = "ERR"
             detail = str(ex)
@@ -175,17 +328,33 @@ class ValidationWorkflow:
             return ""
         return str(first).strip()
 
+    # Report column -> DICOM JSON tag.
+    _REPORT_TAGS = (
+        ("nome_paciente", "00100010"),
+        ("data_nascimento", "00100030"),
+        ("prontuario", "00100020"),
+        ("accession_number", "00080050"),
+        ("sexo", "00100040"),
+        ("data_exame", "00080020"),
+        ("descricao_exame", "00081030"),
+        ("study_uid", "0020000D"),
+    )
+    # Shared read-only result for IUIDs the API did not return; callers copy before changing it.
+    _EMPTY_REPORT_FIELDS = {name: "" for name, _tag in _REPORT_TAGS}
+
     def _report_fields_from_dataset(self, dataset: dict) -> dict:
-        return {
-            "nome_paciente": self._dicom_text(dataset, "00100010"),
-            "data_nascimento": self._dicom_text(dataset, "00100030"),
-            "prontuario": self._dicom_text(dataset, "00100020"),
-            "accession_number": self._dicom_text(dataset, "00080050"),
-            "sexo": self._dicom_text(dataset, "00100040"),
-            "data_exame": self._dicom_text(dataset, "00080020"),
-            "descricao_exame": self._dicom_text(dataset, "00081030"),
-            "study_uid": self._dicom_text(dataset, "0020000D"),
-        }
+        get = dataset.get
+        dicom_text = self._dicom_text
+        out: dict[str, str] = {}
+        for name, tag in self._REPORT_TAGS:
+            elem = get(tag)
+            values = elem.get("Value") if isinstance(elem, dict) else None
+            # Fast path for the common plain-string value; PN/other shapes go through _dicom_text.
+            if isinstance(values, list) and values and isinstance(values[0], str):
+                out[name] = values[0].strip()
+            else:
+                out[name] = dicom_text(dataset, tag)
+        return out
 
     def export_complete_report(self, run_id: str, report_mode: str = "A") -> dict:
         run = run_id.strip()
@@ -207,43 +376,44 @@ class ValidationWorkflow:
         if not send_results.exists():
             raise RuntimeError(f"Arquivo nao encontrado: {send_results}")
 
-        send_rows = read_csv_rows(send_results)
-        map_by_file = build_iuid_map_from_send_rows(send_rows)
-        merge_iuid_map_from_legacy_file(map_by_file, legacy_file_iuid_map)
-
-        sent_ok_rows = [r for r in send_rows if r.get("send_status", "") == "SENT_OK"]
-        if not sent_ok_rows:
-            raise RuntimeError("Nenhum arquivo SENT_OK encontrado para exportacao.")
+        send_rows, map_by_file = self._load_send_rows(send_results, legacy_file_iuid_map)
 
         report_records: list[dict] = []
         updates_by_file: dict[str, dict] = {}
-        for row in sent_ok_rows:
+        sent_ok_total = 0
+        # Single pass over send_rows: SENT_OK filter and IUID resolution together.
+        for row in send_rows:
+            if row.get("send_status", "") != "SENT_OK":
+                continue
+            sent_ok_total += 1
             fp = row.get("file_path", "").strip()
             if not fp:
                 continue
-            meta = map_by_file.get(fp, {})
-            iuid = str(meta.get("sop_instance_uid", "")).strip()
-            if not iuid:
-                iuid, ts_uid, ts_name, err = self.driver.extract_metadata(self.cfg, Path(fp))
-                if iuid:
-                    map_by_file[fp] = {
-                        "sop_instance_uid": iuid,
-                        "source_ts_uid": ts_uid,
-                        "source_ts_name": ts_name,
-                        "extract_status": "REPORT_EXPORT_OK",
-                    }
-                    updates_by_file[fp] = {
-                        "sop_instance_uid": iuid,
-                        "source_ts_uid": ts_uid,
-                        "source_ts_name": ts_name,
-                        "extract_status": "REPORT_EXPORT_OK",
-                    }
-                else:
-                    self._log(f"[WARN] IUID ausente para arquivo no relatorio: {fp} | erro={err or 'desconhecido'}")
+            iuid = map_by_file.get(fp, EMPTY_IUID_MAP_ENTRY).sop_instance_uid
             report_records.append({"file_path": fp, "sop_instance_uid": iuid})
+        if not sent_ok_total:
+            raise RuntimeError("Nenhum arquivo SENT_OK encontrado para exportacao.")
+
+        # Files whose IUID is not in send_results are read from disk in one batch.
+        metadata_by_file = self._extract_metadata_many(
+            [rec["file_path"] for rec in report_records if not rec["sop_instance_uid"]]
+        )
+        for rec in report_records:
+            if rec["sop_instance_uid"]:
+                continue
+            fp = rec["file_path"]
+            iuid, ts_uid, ts_name, err = metadata_by_file[fp]
+            if iuid:
+                entry = IuidMapEntry(iuid, ts_uid, ts_name, "REPORT_EXPORT_OK")
+                map_by_file[fp] = entry
+                updates_by_file[fp] = entry._asdict()
+                rec["sop_instance_uid"] = iuid
+            else:
+                self._log(f"[WARN] IUID ausente para arquivo no relatorio: {fp} | erro={err or 'desconhecido'}")
 
         updated_rows = apply_send_result_updates(send_results, run, updates_by_file)
         if updated_rows > 0:
+            self._invalidate_send_rows_cache()
             self._log(f"[CORE_COMPACT] send_results_by_file atualizado com IUID para {updated_rows} arquivo(s).")
 
         unique_iuids = sorted({r["sop_instance_uid"] for r in report_records if r["sop_instance_uid"]})
@@ -258,10 +428,12 @@ class ValidationWorkflow:
             scope="report_export",
             cancel_message="Exportacao de relatorio cancelada.",
         ):
-            fields = self._report_fields_from_dataset(query.get("dataset", {}))
-            status = "OK" if query.get("api_found", 0) == 1 else "ERRO"
-            http_status = str(query.get("http_status", ""))
-            detail = str(query.get("detail", ""))
+            api_found, http_status, detail = self._lookup_fields(query)
+            if api_found == 1:
+                fields = self._report_fields_from_dataset(query.get("dataset", {}))
+            else:
+                fields = self._EMPTY_REPORT_FIELDS
+            status = "OK" if api_found == 1 else "ERRO"
             iuid_data[iuid] = {
                 **fields,
                 "status": status,
@@ -272,7 +444,7 @@ class ValidationWorkflow:
                 report_ok += 1
             else:
                 report_err += 1
-                if http_status in ["ERR", ""]:
+                if http_status in _API_ERROR_HTTP_STATUSES:
                     report_api_err += 1
                     self._log(
                         f"[REPORT_API_ERROR] iuid={iuid} http_status={http_status or 'ERR'} "
@@ -348,36 +520,26 @@ class ValidationWorkflow:
             self._log(f"[REPORT_EXPORT] Relatorio A exportado: {report_file} | linhas={len(rows_a)} ok={status_ok} erro={status_err}")
             return {"run_id": run, "mode": mode, "report_file": str(report_file), "rows": len(rows_a), "ok": status_ok, "erro": status_err}
 
-        grouped: dict[str, dict] = {}
-        for row in rows_a:
+        def study_key(row: dict) -> str:
             study_uid = row.get("study_uid", "").strip()
-            key = study_uid if study_uid else f"__ERRO__{row.get('sop_instance_uid', '').strip() or row.get('file_path', '').strip()}"
-            agg = grouped.setdefault(
-                key,
-                {
-                    "run_id": run,
-                    "study_uid": study_uid,
-                    "nome_paciente": "",
-                    "data_nascimento": "",
-                    "prontuario": "",
-                    "accession_number": "",
-                    "sexo": "",
-                    "data_exame": "",
-                    "descricao_exame": "",
-                    "status": "OK",
-                    "total_arquivos": 0,
-                },
-            )
-            agg["total_arquivos"] = int(agg.get("total_arquivos", 0)) + 1
+            return study_uid if study_uid else f"__ERRO__{row.get('sop_instance_uid', '').strip() or row.get('file_path', '').strip()}"
+
+        # Stable sort by study keeps file order inside each group, so "first non-empty" per field is unchanged.
+        keyed = sorted(((study_key(row), pos, row) for pos, row in enumerate(rows_a)), key=itemgetter(0, 1))
+        study_groups: list[tuple[str, int, dict]] = []
+        for _key, group in groupby(keyed, key=itemgetter(0)):
+            items = list(group)
+            group_rows = [row for _k, _pos, row in items]
+            study_uid = group_rows[0].get("study_uid", "").strip()
+            agg = {"run_id": run, "study_uid": study_uid}
             for f in ["nome_paciente", "data_nascimento", "prontuario", "accession_number", "sexo", "data_exame", "descricao_exame"]:
-                if not agg.get(f):
-                    agg[f] = row.get(f, "")
-            if not agg.get("study_uid"):
-                agg["study_uid"] = study_uid
-            if row.get("status", "ERRO") == "ERRO":
-                agg["status"] = "ERRO"
-
-        rows_c = sorted(grouped.values(), key=lambda x: str(x.get("study_uid", "")))
+                agg[f] = next((row[f] for row in group_rows if row.get(f)), "")
+            agg["status"] = "ERRO" if any(row.get("status", "ERRO") == "ERRO" for row in group_rows) else "OK"
+            agg["total_arquivos"] = len(group_rows)
+            study_groups.append((study_uid, items[0][1], agg))
+
+        # Same order as before: by study_uid, ties (error groups) in order of first appearance.
+        rows_c = [agg for _study_uid, _pos, agg in sorted(study_groups, key=itemgetter(0, 1))]
         report_file = resolve_run_artifact_path(
             run_dir, "validation_full_report_C.csv", for_write=True, logger=self._log, keep_legacy_on_write=False
         )
@@ -401,6 +563,19 @@ class ValidationWorkflow:
         return {"run_id": run, "mode": mode, "report_file": str(report_file), "rows": len(rows_c), "ok": status_ok, "erro": status_err}
 
     def run_validation(self, run_id: str) -> dict:
+        try:
+            return self._run_validation(run_id)
+        finally:
+            if self._events_emitter is not None:
+                events_error = self._events_emitter.close()
+                if events_error is not None:
+                    self._log(
+                        f"[WARN] events.csv: {self._events_emitter.dropped_events} evento(s) descartado(s) "
+                        f"| erro={events_error}"
+                    )
+                self._events_emitter = None
+
+    def _run_validation(self, run_id: str) -> dict:
         validation_start_ts = time.monotonic()
         parallel_requests = self._validation_parallel_requests()
         run = run_id.strip()
@@ -418,25 +593,35 @@ class ValidationWorkflow:
         for filename in ["validation_results.csv", "validation_by_iuid.csv", "validation_by_file.csv", "reconciliation_report.csv"]:
             cleanup_run_artifact_variants(run_dir, filename)
         events = resolve_run_artifact_path(run_dir, "events.csv", for_write=True, logger=self._log)
+        self._events_emitter = TelemetryEventEmitter(events)
+        emit_event = self._events_emitter.emit
         validation_results = resolve_run_artifact_path(run_dir, "validation_results.csv", for_write=True, logger=self._log)
         recon = resolve_run_artifact_path(run_dir, "reconciliation_report.csv", for_write=True, logger=self._log)
 
-        send_rows = read_csv_rows(send_results)
-        map_by_file = build_iuid_map_from_send_rows(send_rows)
-        merge_iuid_map_from_legacy_file(map_by_file, legacy_file_iuid_map)
+        send_rows, map_by_file = self._load_send_rows(send_results, legacy_file_iuid_map)
 
         total_send_rows = len(send_rows)
-        send_ok_files = sum(1 for r in send_rows if r.get("send_status", "") == "SENT_OK")
-        send_warn_files = sum(1 for r in send_rows if r.get("send_status", "") in ["NON_DICOM", "UNSUPPORTED_DICOM_OBJECT", "SENT_UNKNOWN"])
-        send_fail_files = sum(1 for r in send_rows if r.get("send_status", "") == "SEND_FAIL")
+        # One pass over send_rows for the status counters and the SENT_OK paths used below.
+        send_ok_files = 0
+        send_warn_files = 0
+        send_fail_files = 0
+        sent_ok_paths: list[str] = []
+        for row in send_rows:
+            st = row.get("send_status", "")
+            if st == "SENT_OK":
+                send_ok_files += 1
+                sent_ok_paths.append(row.get("file_path", "").strip())
+            elif st in SEND_WARNING_STATUSES:
+                send_warn_files += 1
+            elif st == "SEND_FAIL":
+                send_fail_files += 1
         self._log(f"[VAL_START] run_id={run}")
         self._log(
             f"[VAL_RESULT] send_total={total_send_rows} sent_ok={send_ok_files} "
             f"warn={send_warn_files} fail={send_fail_files}"
         )
         self._log(f"Mapeamentos IUID atuais (send_results+fallback legado): {len(map_by_file)}")
-        write_telemetry_event(
-            events,
+        emit_event(
             run,
             "VALIDATION_START",
             "Validacao iniciada.",
@@ -448,36 +633,23 @@ class ValidationWorkflow:
 
         updates_by_file: dict[str, dict] = {}
         # consistency check: complete missing IUIDs before API calls
-        for row in send_rows:
-            if row.get("send_status", "") != "SENT_OK":
-                continue
-            fp = row.get("file_path", "").strip()
+        metadata_by_file = self._extract_metadata_many([fp for fp in sent_ok_paths if fp and fp not in map_by_file])
+        for fp in sent_ok_paths:
             if not fp or fp in map_by_file:
                 continue
-            iuid, ts_uid, ts_name, err = self.driver.extract_metadata(self.cfg, Path(fp))
+            iuid, ts_uid, ts_name, err = metadata_by_file[fp]
             if iuid:
-                map_by_file[fp] = {
-                    "sop_instance_uid": iuid,
-                    "source_ts_uid": ts_uid,
-                    "source_ts_name": ts_name,
-                    "extract_status": "CONSISTENCY_OK",
-                }
-                updates_by_file[fp] = {
-                    "sop_instance_uid": iuid,
-                    "source_ts_uid": ts_uid,
-                    "source_ts_name": ts_name,
-                    "extract_status": "CONSISTENCY_OK",
-                }
-                write_telemetry_event(
-                    events,
+                entry = IuidMapEntry(iuid, ts_uid, ts_name, "CONSISTENCY_OK")
+                map_by_file[fp] = entry
+                updates_by_file[fp] = entry._asdict()
+                emit_event(
                     run,
                     "CONSISTENCY_FILLED",
                     "IUID preenchido antes da validacao.",
                     f"file_path={fp}",
                 )
             else:
-                write_telemetry_event(
-                    events,
+                emit_event(
                     run,
                     "CONSISTENCY_MISSING",
                     err or "Nao foi possivel extrair IUID.",
@@ -486,17 +658,15 @@ class ValidationWorkflow:
 
         updated_rows = apply_send_result_updates(send_results, run, updates_by_file)
         if updated_rows > 0:
+            self._invalidate_send_rows_cache()
             self._log(f"[CORE_COMPACT] send_results_by_file atualizado pela consistencia em {updated_rows} arquivo(s).")
 
-        iuid_to_files: dict[str, list[str]] = {}
-        for row in send_rows:
-            if row.get("send_status", "") != "SENT_OK":
-                continue
-            fp = row.get("file_path", "").strip()
-            iuid = str(map_by_file.get(fp, {}).get("sop_instance_uid", "")).strip()
+        iuid_to_files: defaultdict[str, list[str]] = defaultdict(list)
+        for fp in sent_ok_paths:
+            iuid = map_by_file.get(fp, EMPTY_IUID_MAP_ENTRY).sop_instance_uid
             if not iuid:
                 continue
-            iuid_to_files.setdefault(iuid, []).append(fp)
+            iuid_to_files[iuid].append(fp)
 
         self._log(f"IUIDs unicos para consulta API: {len(iuid_to_files)}")
 
@@ -516,60 +686,58 @@ class ValidationWorkflow:
         miss_count = 0
         api_err_count = 0
         iuid_list = list(iuid_to_files.keys())
-        for iuid, query, processed_count, processed_total in self._iter_iuid_queries(
-            iuid_list,
-            scope="run_validation",
-            cancel_message="Validacao cancelada.",
-        ):
-            files = iuid_to_files.get(iuid, [])
-            api_found = 1 if query.get("api_found", 0) == 1 else 0
-            http_status = str(query.get("http_status", ""))
-            detail = str(query.get("detail", ""))
-
-            if api_found == 1:
-                ok_count += 1
-            else:
-                if http_status in ["ERR", ""]:
-                    api_err_count += 1
+        # validation_results is opened once; each IUID writes all of its files with one writerows().
+        # No IUIDs to check leaves no validation_results file, as before the appender.
+        with (
+            CsvAppender(validation_results, validation_fields) if iuid_list else nullcontext()
+        ) as validation_writer:
+            for iuid, query, processed_count, processed_total in self._iter_iuid_queries(
+                iuid_list,
+                scope="run_validation",
+                cancel_message="Validacao cancelada.",
+            ):
+                files = iuid_to_files.get(iuid, [])
+                api_found, http_status, detail = self._lookup_fields(query)
+
+                if api_found == 1:
+                    ok_count += 1
                 else:
-                    miss_count += 1
+                    if http_status in _API_ERROR_HTTP_STATUSES:
+                        api_err_count += 1
+                    else:
+                        miss_count += 1
 
-            status = "OK" if api_found == 1 else ("API_ERROR" if http_status in ["ERR", ""] else "NOT_FOUND")
-            if status == "API_ERROR":
-                self._log(
-                    f"[VAL_API_ERROR] iuid={iuid} http_status={http_status or 'ERR'} "
-                    f"detail={detail or 'sem_detalhe'}"
-                )
-            for fp in files:
-                write_csv_row(
-                    validation_results,
-                    {
-                        "run_id": run,
-                        "file_path": fp,
-                        "sop_instance_uid": iuid,
-                        "send_status": "SENT_OK",
-                        "validation_status": status,
-                        "api_found": api_found,
-                        "http_status": http_status,
-                        "detail": detail,
-                        "checked_at": now_br(),
-                    },
-                    validation_fields,
-                )
-            if processed_count % 100 == 0 or processed_count == processed_total:
-                self._log(
-                    f"Progresso validacao API: {processed_count}/{processed_total} "
-                    f"(ok={ok_count}, nf={miss_count}, api_err={api_err_count})"
+                status = "OK" if api_found == 1 else ("API_ERROR" if http_status in _API_ERROR_HTTP_STATUSES else "NOT_FOUND")
+                if status == "API_ERROR":
+                    self._log(
+                        f"[VAL_API_ERROR] iuid={iuid} http_status={http_status or 'ERR'} "
+                        f"detail={detail or 'sem_detalhe'}"
+                    )
+                checked_at = now_br()
+                validation_writer.writerows(
+                    [
+                        {
+                            "run_id": run,
+                            "file_path": fp,
+                            "sop_instance_uid": iuid,
+                            "send_status": "SENT_OK",
+                            "validation_status": status,
+                            "api_found": api_found,
+                            "http_status": http_status,
+                            "detail": detail,
+                            "checked_at": checked_at,
+                        }
+                        for fp in files
+                    ]
                 )
+                if processed_count % 100 == 0 or processed_count == processed_total:
+                    self._log(
+                        f"Progresso validacao API: {processed_count}/{processed_total} "
+                        f"(ok={ok_count}, nf={miss_count}, api_err={api_err_count})"
+                    )
 
-        warnings_count = 0
-        fail_count = 0
-        for row in send_rows:
-            st = row.get("send_status", "")
-            if st in ["NON_DICOM", "UNSUPPORTED_DICOM_OBJECT", "SENT_UNKNOWN"]:
-                warnings_count += 1
-            elif st in ["SEND_FAIL"]:
-                fail_count += 1
+        warnings_count = send_warn_files
+        fail_count = send_fail_files
 
         final_status = "PASS"
         if fail_count > 0 or api_err_count > 0 or miss_count > 0:
@@ -623,8 +791,7 @@ class ValidationWorkflow:
                 f"iuid_not_found={miss_count} iuid_api_error={api_err_count} send_fail={fail_count}"
             )
         self._log(f"[VAL_END] run_id={run} status={final_status} duration={format_duration_sec(validation_duration_sec)}")
-        write_telemetry_event(
-            events,
+        emit_event(
             run,
             "VALIDATION_END",
             "Validacao finalizada.",